@@ -26,9 +26,16 @@ from .src.operators.download_files_operator import (  # ty:ignore[unresolved-imp
 from .src.operators.dump_files_operator import DumpFilesOperator  # ty:ignore[unresolved-import]
 from .src.operators.forge_map_operator import ForgeMapOperator  # ty:ignore[unresolved-import]
 from .src.operators.forge_operator import ForgeOperator  # ty:ignore[unresolved-import]
-from .src.operators.level_operator import ImportLevelOperator  # ty:ignore[unresolved-import]
+from .src.operators.level_operator import (  # ty:ignore[unresolved-import]
+    ConvertLevelOperator,
+    ImportLevelOperator,
+    RealizeLevelInstancesOperator,
+)
 from .src.operators.material_operator import ImportMaterialOperator  # ty:ignore[unresolved-import]
-from .src.operators.model_operator import ImportModelOperator  # ty:ignore[unresolved-import]
+from .src.operators.model_operator import (  # ty:ignore[unresolved-import]
+    FindModelsOperator,
+    ImportModelOperator,
+)
 from .src.operators.randomize_coating import (  # ty:ignore[unresolved-import]
     RandomizeCoatingOperator,
 )
@@ -99,6 +106,19 @@ class EkurPreferences(AddonPreferences):
         default=False,
     )
 
+    use_model_cache: bpy.props.BoolProperty(
+        name="Cache Models",
+        description="Store decoded models on disk so importing them again skips decoding.",
+        default=True,
+    )
+
+    model_cache_size: bpy.props.IntProperty(
+        name="Model Cache Size (MB)",
+        description="Maximum size of the model cache, least recently used models are removed first.",
+        default=2048,
+        min=0,
+    )
+
     def draw(self, _context: Context | None):
         layout = self.layout
         if not dump_exists():
@@ -119,6 +139,8 @@ class EkurPreferences(AddonPreferences):
         box.prop(self, "dump_textures")
         box.prop(self, "is_campaign")
         box.prop(self, "debug")
+        box.prop(self, "use_model_cache")
+        box.prop(self, "model_cache_size")
         box2 = layout.box()
         _ = box2.operator("ekur.downloadfiles")
         _ = box2.operator("ekur.dumpfiles")
@@ -132,8 +154,11 @@ def register():
     register_class(DownloadFilesOperator)
     register_class(DumpFilesOperator)
     register_class(ImportModelOperator)
+    register_class(FindModelsOperator)
     register_class(ImportSpartanOperator)
     register_class(ImportLevelOperator)
+    register_class(RealizeLevelInstancesOperator)
+    register_class(ConvertLevelOperator)
     register_class(ForgeOperator)
     register_class(ImportVanityOperator)
     register_class(ForgeMapOperator)
@@ -166,8 +191,11 @@ def unregister():
     unregister_class(DownloadFilesOperator)
     unregister_class(DumpFilesOperator)
     unregister_class(ImportModelOperator)
+    unregister_class(FindModelsOperator)
     unregister_class(ImportSpartanOperator)
     unregister_class(ImportLevelOperator)
+    unregister_class(RealizeLevelInstancesOperator)
+    unregister_class(ConvertLevelOperator)
     unregister_class(ForgeOperator)
     unregister_class(ImportVanityOperator)
     unregister_class(ForgeMapOperator)
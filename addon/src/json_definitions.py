@@ -43,6 +43,9 @@ __all__ = [
     "Asset",
     "Coating",
     "Attachment",
+    "ModelSummaryRegion",
+    "ModelSummary",
+    "ModelCatalogue",
 ]
 
 
@@ -466,3 +469,25 @@ class ForgeLayer(TypedDict):
 class ForgeMaterial(TypedDict):
     layers: dict[str, ForgeLayer]
     colors: list[tuple[float, float, float]]
+
+
+class ModelSummaryRegion(TypedDict):
+    name: int
+    permutations: list[int]
+
+
+class ModelSummary(TypedDict):
+    size: int
+    mtime_ns: int
+    tag_id: int
+    is_rtgo: bool
+    regions: list[ModelSummaryRegion]
+    materials: list[int]
+    section_count: int
+    vertex_count: int
+    index_count: int
+
+
+class ModelCatalogue(TypedDict):
+    version: int
+    models: dict[str, ModelSummary]
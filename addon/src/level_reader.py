@@ -0,0 +1,251 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2026 The Halo Archive
+import json
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+from .json_definitions import Instance
+
+__all__ = [
+    "LEVEL_MAGIC",
+    "LEVEL_VERSION",
+    "convert_level",
+    "iter_level_batches",
+    "iter_level_instances",
+    "write_binary_level",
+]
+
+LEVEL_MAGIC = b"EKLV"
+LEVEL_VERSION = 1
+
+# Magic, version, instance count and offset of the material table
+_HEADER = struct.Struct("<4sIQQ")
+_COUNT = struct.Struct("<I")
+_RECORD = np.dtype(
+    [
+        ("global_id", "<i8"),
+        ("position", "<f4", 3),
+        ("scale", "<f4", 3),
+        ("forward", "<f4", 3),
+        ("left", "<f4", 3),
+        ("up", "<f4", 3),
+        ("bounding_box_index", "<i4"),
+        ("material_set", "<u4"),
+    ]
+)
+_INSTANCES_KEY = '"instances"'
+_SEPARATORS = " \t\r\n,"
+_DECODER = json.JSONDecoder()
+# How many chunks an instance may span before the file is considered malformed
+_MAX_INSTANCE_CHUNKS = 16
+
+
+def iter_level_instances(path: str | Path, chunk_size: int = 1 << 20) -> Iterator[Instance]:
+    """
+    Reads the instances of a json level file one at a time. The file is read in chunks, so only
+    the instance being decoded is held in memory rather than the whole level.
+
+    Args:
+    - path: The path to the level file.
+    - chunk_size: The number of characters to read from the file at once. A ValueError is raised
+      for an instance that doesn't decode within a few chunks or is cut off by the end of the file.
+
+    Returns:
+    - The instances of the level, in file order.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        while True:
+            start = buffer.find(_INSTANCES_KEY)
+            bracket = buffer.find("[", start) if start >= 0 else -1
+            if bracket >= 0:
+                buffer = buffer[bracket + 1 :]
+                break
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError(f"Level file has no instances: {path}")
+            # Keep enough of the buffer to match a key split across chunks
+            buffer = (buffer if start >= 0 else buffer[-len(_INSTANCES_KEY) :]) + chunk
+
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in _SEPARATORS:
+                position += 1
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                if position == len(buffer):
+                    raise json.JSONDecodeError("Unexpected end of buffer", buffer, position)
+                instance, position = _DECODER.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                # Instances are objects, so one cut off by the end of the buffer never decodes
+                pending = len(buffer) - position
+                if pending > _MAX_INSTANCE_CHUNKS * chunk_size:
+                    raise ValueError(f"Level file has a malformed instance: {path}") from e
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise ValueError(f"Level file ends in the middle of an instance: {path}") from e
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield instance
+            if position > chunk_size:
+                buffer = buffer[position:]
+                position = 0
+
+
+def _iter_binary_batches(path: Path, batch_size: int) -> Iterator[list[Instance]]:
+    with open(path, "rb") as f:
+        magic, version, count, table_offset = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != LEVEL_MAGIC or version != LEVEL_VERSION:
+            raise ValueError(f"Unsupported binary level file: {path}")
+
+        _ = f.seek(table_offset)
+        (set_count,) = _COUNT.unpack(f.read(_COUNT.size))
+        material_sets: list[list[int]] = []
+        for _ in range(set_count):
+            (length,) = _COUNT.unpack(f.read(_COUNT.size))
+            material_sets.append(np.fromfile(f, dtype="<i8", count=length).tolist())
+
+        _ = f.seek(_HEADER.size)
+        remaining = count
+        while remaining > 0:
+            records = np.fromfile(f, dtype=_RECORD, count=min(batch_size, remaining))
+            if len(records) == 0:
+                raise EOFError(f"Binary level file is truncated: {path}")
+            remaining -= len(records)
+            yield [
+                {
+                    "global_id": global_id,
+                    "position": tuple(position),
+                    "scale": tuple(scale),
+                    "forward": tuple(forward),
+                    "left": tuple(left),
+                    "up": tuple(up),
+                    "material": material_sets[material_set],
+                    "bounding_box_index": bounding_box_index,
+                }
+                for (
+                    global_id,
+                    position,
+                    scale,
+                    forward,
+                    left,
+                    up,
+                    bounding_box_index,
+                    material_set,
+                ) in zip(
+                    records["global_id"].tolist(),
+                    records["position"].tolist(),
+                    records["scale"].tolist(),
+                    records["forward"].tolist(),
+                    records["left"].tolist(),
+                    records["up"].tolist(),
+                    records["bounding_box_index"].tolist(),
+                    records["material_set"].tolist(),
+                )
+            ]
+
+
+def iter_level_batches(path: str | Path, batch_size: int = 4096) -> Iterator[list[Instance]]:
+    """
+    Reads the instances of a level file in batches. Both json level files and binary ones written
+    by `write_binary_level` are supported.
+
+    Args:
+    - path: The path to the level file.
+    - batch_size: The maximum number of instances per batch.
+
+    Returns:
+    - The batches of instances, in file order.
+    """
+    level_path = Path(path)
+    with open(level_path, "rb") as f:
+        is_binary = f.read(len(LEVEL_MAGIC)) == LEVEL_MAGIC
+    if is_binary:
+        yield from _iter_binary_batches(level_path, batch_size)
+        return
+
+    batch: list[Instance] = []
+    for instance in iter_level_instances(level_path):
+        batch.append(instance)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_binary_level(
+    instances: Iterable[Instance], path: str | Path, batch_size: int = 4096
+) -> int:
+    """
+    Writes level instances to a compact binary file. Transforms are stored as 32 bit floats, and
+    identical material lists are stored once.
+
+    Args:
+    - instances: The instances to write, they are consumed in batches.
+    - path: The path to write the file to.
+    - batch_size: The number of instances to convert at once.
+
+    Returns:
+    - The number of instances written.
+    """
+    output = Path(path)
+    temp_path = output.with_suffix(f".{os.getpid()}.tmp")
+    material_sets: dict[tuple[int, ...], int] = {}
+    records = np.zeros(batch_size, dtype=_RECORD)
+    count = 0
+    try:
+        with open(temp_path, "wb") as f:
+            _ = f.write(_HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, 0, 0))
+            filled = 0
+            for instance in instances:
+                record = records[filled]
+                record["global_id"] = instance["global_id"]
+                record["position"] = instance["position"]
+                record["scale"] = instance["scale"]
+                record["forward"] = instance["forward"]
+                record["left"] = instance["left"]
+                record["up"] = instance["up"]
+                record["bounding_box_index"] = instance.get("bounding_box_index", -1)
+                record["material_set"] = material_sets.setdefault(
+                    tuple(instance["material"]), len(material_sets)
+                )
+                filled += 1
+                if filled == batch_size:
+                    _ = f.write(records.tobytes())
+                    count += filled
+                    filled = 0
+            _ = f.write(records[:filled].tobytes())
+            count += filled
+
+            table_offset = f.tell()
+            _ = f.write(_COUNT.pack(len(material_sets)))
+            for materials in material_sets:
+                _ = f.write(_COUNT.pack(len(materials)))
+                _ = f.write(np.array(materials, dtype="<i8").tobytes())
+            _ = f.seek(0)
+            _ = f.write(_HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, count, table_offset))
+        os.replace(temp_path, output)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return count
+
+
+def convert_level(json_path: str | Path, binary_path: str | Path) -> int:
+    """
+    Converts a json level file to the binary level format without loading it whole.
+
+    Args:
+    - json_path: The path to the json level file.
+    - binary_path: The path to write the binary level file to.
+
+    Returns:
+    - The number of instances converted.
+    """
+    return write_binary_level(iter_level_instances(json_path), binary_path)
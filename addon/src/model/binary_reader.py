@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2026 The Halo Archive
+import struct
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+__all__ = ["BinaryReader"]
+
+_U8 = struct.Struct("<B")
+_I8 = struct.Struct("<b")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+
+
+class BinaryReader:
+    """
+    Walks a model file that has been loaded into memory in one go. Values are unpacked straight
+    from the underlying buffer by offset, so no intermediate bytes object is created per field.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview | mmap) -> None:
+        self.data: memoryview = memoryview(data).cast("B")
+        self.offset: int = 0
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "BinaryReader":
+        """
+        Loads the whole file at the given path with a single read.
+
+        Args:
+        - path: The path to the file.
+
+        Returns:
+        - A reader positioned at the start of the file.
+        """
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @classmethod
+    def map_file(cls, path: str | Path) -> "BinaryReader":
+        """
+        Memory maps the file at the given path instead of reading it, so only the parts of the file
+        that are accessed are read from disk. The map is closed once the reader and every reader
+        made from it are gone.
+
+        Args:
+        - path: The path to the file, it must not be empty.
+
+        Returns:
+        - A reader positioned at the start of the file.
+        """
+        with open(path, "rb") as f:
+            return cls(mmap(f.fileno(), 0, access=ACCESS_READ))
+
+    def at(self, offset: int) -> "BinaryReader":
+        """
+        Gets a new reader over the same buffer, positioned at the given offset.
+        """
+        reader = BinaryReader(self.data)
+        reader.offset = offset
+        return reader
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def unpack(self, fmt: struct.Struct) -> tuple[Any, ...]:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def read(self, size: int) -> memoryview:
+        if self.offset + size > len(self.data):
+            raise EOFError(
+                f"Tried to read {size} bytes at {self.offset}, past the end of the buffer!"
+            )
+        view = self.data[self.offset : self.offset + size]
+        self.offset += size
+        return view
+
+    def skip(self, size: int) -> None:
+        if self.offset + size > len(self.data):
+            raise EOFError(
+                f"Tried to skip {size} bytes at {self.offset}, past the end of the buffer!"
+            )
+        self.offset += size
+
+    def read_u8(self) -> int:
+        return self.unpack(_U8)[0]
+
+    def read_i8(self) -> int:
+        return self.unpack(_I8)[0]
+
+    def read_u32(self) -> int:
+        return self.unpack(_U32)[0]
+
+    def read_i32(self) -> int:
+        return self.unpack(_I32)[0]
+
+    def read_string(self) -> str:
+        """
+        Reads a string prefixed by its length as a single byte.
+        """
+        length = self.read_u8()
+        return str(self.read(length), "utf-8")
+
+    def read_array(self, dtype: npt.DTypeLike, count: int) -> npt.NDArray[Any]:
+        """
+        Gets a read-only array view over the next `count` elements of the given type.
+        """
+        array = np.frombuffer(self.data, dtype=dtype, count=count, offset=self.offset)
+        self.offset += array.nbytes
+        return array
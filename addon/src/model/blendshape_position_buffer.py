@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
 from ..exceptions import IncorrectStrideValue
+from .binary_reader import BinaryReader
 from .vectors import WordVector3DNormalizedWith4Word
 
 __all__ = ["BlendShapePositionBuffer"]
@@ -12,21 +14,24 @@ class BlendShapePositionBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.positions: list[list[WordVector3DNormalizedWith4Word]] = []
+        self.deltas: npt.NDArray[np.float32] = np.empty((0, 3), dtype=np.float32)
+        self.order: npt.NDArray[np.intp] = np.empty(0, dtype=np.intp)
+        self.targets: npt.NDArray[np.uint16] = np.empty(0, dtype=np.uint16)
+        self.target_offsets: npt.NDArray[np.intp] = np.zeros(1, dtype=np.intp)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: BinaryReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 8:
             raise IncorrectStrideValue("Blendshape position buffer stride was not 8!")
-        self.count = int.from_bytes(reader.read(4), "little")
-        positions: list[WordVector3DNormalizedWith4Word] = []
-        for _ in range(self.count):
-            position = WordVector3DNormalizedWith4Word()
-            position.read(reader)
-            positions.append(position)
+        self.count = reader.read_u32()
+        deltas, indices = WordVector3DNormalizedWith4Word.read_array(reader, self.count)
+        if self.count == 0:
+            return
 
-        unique_index: set[int] = set()
-        unique_index.update([x.index for x in positions])
-
-        for unique in unique_index:
-            self.positions.append([x for x in positions if x.index == unique])
+        # Group the deltas by target, keeping their original order within each target
+        self.order = np.argsort(indices, kind="stable")
+        self.deltas = deltas[self.order]
+        sorted_indices = indices[self.order]
+        starts = np.flatnonzero(np.diff(sorted_indices)) + 1
+        self.targets = sorted_indices[np.concatenate(([0], starts))]
+        self.target_offsets = np.concatenate(([0], starts, [self.count])).astype(np.intp)
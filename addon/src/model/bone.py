@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
-
+from .binary_reader import BinaryReader
 from .vectors import Matrix4x4
 
 __all__ = ["Bone"]
@@ -15,10 +14,9 @@ class Bone:
         self.transformation_matrix: Matrix4x4 = Matrix4x4()
         self.world_transform: Matrix4x4 = Matrix4x4()
 
-    def read(self, reader: BufferedReader) -> None:
-        name_length = int.from_bytes(reader.read(1), "little")
-        self.name = reader.read(name_length).decode("utf-8")
-        self.parent_index = int.from_bytes(reader.read(4), "little", signed=True)
+    def read(self, reader: BinaryReader) -> None:
+        self.name = reader.read_string()
+        self.parent_index = reader.read_i32()
         self.rotation_matrix.read(reader)
         self.transformation_matrix.read(reader)
         self.world_transform.read(reader)
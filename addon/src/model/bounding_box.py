@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
-
+from .binary_reader import BinaryReader
 from .vectors import Bounds
 
 __all__ = ["BoundingBox"]
@@ -19,7 +18,7 @@ class BoundingBox:
         self.u_bounds2: Bounds = Bounds()
         self.v_bounds2: Bounds = Bounds()
 
-    def read(self, reader: BufferedReader) -> None:
+    def read(self, reader: BinaryReader) -> None:
         self.x_bounds.read(reader)
         self.y_bounds.read(reader)
         self.z_bounds.read(reader)
@@ -1,10 +1,14 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
 import logging
-from io import BufferedReader
+import struct
+
+from .binary_reader import BinaryReader
 
 __all__ = ["ModelHeader"]
 
+_HEADER = struct.Struct("<iB7I")
+
 
 class ModelHeader:
     def __init__(self) -> None:
@@ -20,19 +24,22 @@ class ModelHeader:
         self.blendshape_bounding_box_count: int = 0
         self.offset_count: int = 0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.magic = reader.read(4).decode("utf-8")
+    def read(self, reader: BinaryReader) -> None:
+        self.magic = str(reader.read(4), "utf-8", errors="replace")
         if self.magic != "SURA":
             logging.critical(f"Invalid magic: {self.magic}, expected SURA!")
             return
-        self.tag_id = int.from_bytes(reader.read(4), "little", signed=True)
-        self.is_rtgo = bool(reader.read(1)[0])
-        self.region_count = int.from_bytes(reader.read(4), "little")
-        self.node_count = int.from_bytes(reader.read(4), "little")
-        self.marker_count = int.from_bytes(reader.read(4), "little")
-        self.material_count = int.from_bytes(reader.read(4), "little")
-        self.section_count = int.from_bytes(reader.read(4), "little")
-        self.bounding_box_count = int.from_bytes(reader.read(4), "little")
-        self.blendshape_bounding_box_count = int.from_bytes(reader.read(4), "little")
+        (
+            self.tag_id,
+            is_rtgo,
+            self.region_count,
+            self.node_count,
+            self.marker_count,
+            self.material_count,
+            self.section_count,
+            self.bounding_box_count,
+            self.blendshape_bounding_box_count,
+        ) = reader.unpack(_HEADER)
+        self.is_rtgo = bool(is_rtgo)
         if self.is_rtgo:
-            self.offset_count = int.from_bytes(reader.read(4), "little")
+            self.offset_count = reader.read_u32()
@@ -1,8 +1,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
 import logging
-import operator
-from functools import reduce
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import cast
 
 import bpy
@@ -10,10 +10,9 @@ from bpy.types import Armature, EditBone, Object
 from mathutils import Matrix
 
 from ...ui.model_options import get_model_options
-from ..bone import Bone
 from ..metadata import Model
 
-__all__ = ["import_bones", "get_bone_transforms"]
+__all__ = ["import_bones", "edit_armature", "get_bone_transforms"]
 
 
 def _create_transform(rot_matrix: Matrix, trans_matrix: Matrix) -> Matrix:
@@ -34,29 +33,10 @@ def _create_transform(rot_matrix: Matrix, trans_matrix: Matrix) -> Matrix:
     return Matrix.Translation(translation.to_tuple() * 1) @ rotation.to_matrix().to_4x4()
 
 
-def _get_bone_lineage(model: Model, bone: Bone) -> list[Bone]:
-    """
-    Get the lineage (list of bones up to it) of the given bone.
-
-    - model: The model containing the rig to get the lineage from.
-    - bone: The bone to get the lineage of.
-
-    Returns:
-    - The lineage of the bone.
-    """
-    lineage = [bone]
-    current_bone = bone
-    while current_bone.parent_index >= 0:
-        if current_bone.parent_index <= len(model.bones):
-            current_bone = model.bones[current_bone.parent_index]
-            lineage.append(current_bone)
-    lineage.reverse()
-    return lineage
-
-
 def get_bone_transforms(model: Model) -> list[Matrix]:
     """
-    Get the global transformation matrices of all bones in the model created through getting the bone lineage.
+    Get the global transformation matrices of all bones in the model. Each bone's matrix is built
+    from its parent's, and the result is cached on the model.
 
     Args:
     - model: The model containing the rig to get the bone transforms from.
@@ -64,16 +44,42 @@ def get_bone_transforms(model: Model) -> list[Matrix]:
     Returns:
     - The transformation matrices of all bones in the model.
     """
-    result: list[Matrix] = []
-    for bone in model.bones:
-        lineage = _get_bone_lineage(model, bone)
-        transforms = [
-            _create_transform(x.rotation_matrix.matrix, x.transformation_matrix.matrix)
-            for x in lineage
-        ]
-        res = cast(Matrix, reduce(operator.matmul, transforms))
-        result.append(res)
-    return result
+    if model.bone_transforms is not None and len(model.bone_transforms) == len(model.bones):
+        return model.bone_transforms
+
+    count = len(model.bones)
+    transforms: list[Matrix | None] = [None] * count
+    for i in range(count):
+        # Walk up until a bone that has already been resolved (or the root) is reached
+        chain: list[int] = []
+        visited: set[int] = set()
+        parent_transform: Matrix | None = None
+        current = i
+        while True:
+            resolved = transforms[current]
+            if resolved is not None:
+                parent_transform = resolved
+                break
+            chain.append(current)
+            visited.add(current)
+            parent = model.bones[current].parent_index
+            if parent < 0:
+                break
+            if parent >= count or parent in visited:
+                logging.warning(f"Bone {model.bones[current].name} has an invalid parent {parent}!")
+                break
+            current = parent
+
+        for index in reversed(chain):
+            bone = model.bones[index]
+            local = _create_transform(
+                bone.rotation_matrix.matrix, bone.transformation_matrix.matrix
+            )
+            parent_transform = local if parent_transform is None else parent_transform @ local
+            transforms[index] = parent_transform
+
+    model.bone_transforms = cast(list[Matrix], transforms)
+    return model.bone_transforms
 
 
 def _create_armature(model: Model) -> tuple[Armature, Object]:
@@ -93,29 +99,69 @@ def _create_armature(model: Model) -> tuple[Armature, Object]:
         bpy.context.scene.collection.objects.link(armature_obj)
     else:
         logging.warning("No scene found to link the armature to!")
-
-    bpy.ops.object.select_all(action="DESELECT")
-    armature_obj.select_set(True)
-    if bpy.context.view_layer is not None:
-        bpy.context.view_layer.objects.active = armature_obj
-    else:
-        logging.warning("No view layer found to set the armature object to!")
-    bpy.ops.object.mode_set(mode="EDIT")
     return armature_data, armature_obj
 
 
-def import_bones(model: Model) -> Object:
+@contextmanager
+def edit_armature(armature: Object) -> Iterator[bool]:
     """
-    Import the bones from the given model.
+    Puts an armature into edit mode for the duration of the context. The armature is selected and
+    made active while it is edited, the previous selection and active object are restored
+    afterwards. The mode switch runs with an overridden context, so this also works when Blender
+    runs in the background.
 
     Args:
-    - model: The model to import the bones from.
+    - armature: The armature object to edit.
 
     Returns:
-    - The armature object containing the bones.
+    - Whether the armature is in edit mode. Armatures that aren't linked to the current view layer
+      can't be edited.
+    """
+    view_layer = bpy.context.view_layer
+    if view_layer is None:
+        logging.warning("No view layer found to edit the armature in!")
+        yield False
+        return
+    if armature.name not in view_layer.objects:
+        logging.warning(f"Armature {armature.name} is not in the view layer!")
+        yield False
+        return
+
+    previous_selection = [obj for obj in view_layer.objects if obj.select_get()]
+    previous_active = view_layer.objects.active
+    for obj in previous_selection:
+        obj.select_set(False)
+    armature.select_set(True)
+    view_layer.objects.active = armature
+
+    try:
+        with bpy.context.temp_override(
+            active_object=armature,
+            object=armature,
+            selected_objects=[armature],
+            selected_editable_objects=[armature],
+        ):
+            _ = bpy.ops.object.mode_set(mode="EDIT")
+            try:
+                yield True
+            finally:
+                _ = bpy.ops.object.mode_set(mode="OBJECT")
+    finally:
+        armature.select_set(False)
+        for obj in previous_selection:
+            obj.select_set(True)
+        view_layer.objects.active = previous_active
+
+
+def _create_edit_bones(model: Model, armature_data: Armature) -> None:
+    """
+    Creates the edit bones of a model. The armature must be in edit mode.
+
+    Args:
+    - model: The model to create the bones from.
+    - armature_data: The armature to create the bones in.
     """
     props = get_model_options()
-    armature_data, armature_obj = _create_armature(model)
     bone_transforms = get_bone_transforms(model)
 
     editbones: list[EditBone] = []
@@ -127,8 +173,24 @@ def import_bones(model: Model) -> Object:
         editbone = editbones[i]  # directly accessing the list is fine here
         editbone.length = props.scale_factor * props.bone_size
         editbone.matrix = bone_transforms[i]
-        if bone.parent_index >= 0:
+        if 0 <= bone.parent_index < len(editbones):
             editbone.parent = editbones[bone.parent_index]
 
-    bpy.ops.object.mode_set(mode="OBJECT")
+
+def import_bones(model: Model) -> Object:
+    """
+    Import the bones from the given model.
+
+    Args:
+    - model: The model to import the bones from.
+
+    Returns:
+    - The armature object containing the bones, it has no bones if it couldn't be edited.
+    """
+    armature_data, armature_obj = _create_armature(model)
+    with edit_armature(armature_obj) as editing:
+        if editing:
+            _create_edit_bones(model, armature_data)
+        else:
+            logging.warning(f"Skipping the bones of {armature_obj.name}!")
     return armature_obj
@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
 import bpy
+import numpy as np
 from bpy.types import Object
 from mathutils import Matrix, Quaternion, Vector
 
@@ -10,7 +11,12 @@ from ..marker import Marker, MarkerInstance
 from ..metadata import Model
 from .bone import get_bone_transforms
 
-__all__ = ["import_markers"]
+__all__ = [
+    "MarkerPoint",
+    "get_marker_points",
+    "import_marker_cloud",
+    "import_markers",
+]
 
 
 def _get_name(marker: Marker, instance: MarkerInstance, model: Model) -> str:
@@ -36,47 +42,136 @@ def _get_name(marker: Marker, instance: MarkerInstance, model: Model) -> str:
     return name
 
 
-def import_markers(model: Model, armature: Object) -> list[Object]:
+class MarkerPoint:
     """
-    Imports the markers of the model.
+    A marker instance resolved to its name, transform and parent bone, without an object in the
+    scene. Exposes the same `name`, `matrix_world` and `parent_bone` as a marker empty.
+    """
+
+    __slots__ = ("armature", "matrix_world", "name", "parent_bone")
+
+    def __init__(
+        self, name: str, matrix_world: Matrix, parent_bone: str, armature: Object | None
+    ) -> None:
+        self.name = name
+        self.matrix_world = matrix_world
+        self.parent_bone = parent_bone
+        self.armature = armature
+
+    def create_empty(self) -> Object:
+        """
+        Creates an empty for the marker, parented to its bone if it has one.
+
+        Returns:
+        - The marker empty.
+        """
+        props = get_model_options()
+        marker_obj = bpy.data.objects.new(self.name, None)
+        marker_obj.empty_display_type = "SPHERE"
+        marker_obj.empty_display_size = 0.01 * props.scale_factor
+        marker_obj.scale = Vector((FEET_TO_METER, FEET_TO_METER, FEET_TO_METER)) * Vector(
+            (props.scale_factor,) * 3
+        )
+        if self.parent_bone and self.armature:
+            marker_obj.parent = self.armature
+            marker_obj.parent_type = "BONE"
+            marker_obj.parent_bone = self.parent_bone
+
+        marker_obj.hide_render = True
+        marker_obj.matrix_world = self.matrix_world
+        marker_obj["is_marker"] = True
+        if bpy.context.scene:
+            bpy.context.scene.collection.objects.link(marker_obj)
+        return marker_obj
+
+
+def get_marker_points(model: Model, armature: Object | None) -> list[MarkerPoint]:
+    """
+    Resolves every marker instance of the model to its world transform.
 
     Args:
-    - model: The model to import the markers from.
-    - armature: The armature to parent the markers to.
+    - model: The model to get the markers from.
+    - armature: The armature the markers belong to.
 
     Returns:
-    - The list of imported markers (as empties)
+    - The list of marker points.
     """
-    props = get_model_options()
-    marker_size = 0.01 * props.scale_factor
     bone_transforms = get_bone_transforms(model)
-    markers: list[Object] = []
-
+    points: list[MarkerPoint] = []
     for marker in model.markers:
         for instance in marker.instances:
-            name = _get_name(marker, instance, model)
-
-            marker_obj = bpy.data.objects.new(str(name), None)
-            marker_obj.empty_display_type = "SPHERE"
-            marker_obj.empty_display_size = marker_size
-            marker_obj.scale = Vector((FEET_TO_METER, FEET_TO_METER, FEET_TO_METER)) * Vector(
-                (props.scale_factor,) * 3
-            )
             world_transform = (
                 Matrix.Translation([v for v in instance.position.vector])
                 @ Quaternion(instance.rotation.vector).to_matrix().to_4x4()
             )
-
+            parent_bone = ""
             if instance.node_index != 255 and len(bone_transforms) > instance.node_index:
                 world_transform = bone_transforms[instance.node_index] @ world_transform
-                marker_obj.parent = armature
-                marker_obj.parent_type = "BONE"
-                marker_obj.parent_bone = str(model.bones[instance.node_index].name)
-
-            marker_obj.hide_render = True
-            marker_obj.matrix_world = world_transform
-            marker_obj["is_marker"] = True
-            if bpy.context.scene:
-                bpy.context.scene.collection.objects.link(marker_obj)
-            markers.append(marker_obj)
-    return markers
+                parent_bone = str(model.bones[instance.node_index].name)
+            points.append(
+                MarkerPoint(
+                    _get_name(marker, instance, model), world_transform, parent_bone, armature
+                )
+            )
+    return points
+
+
+def import_markers(model: Model, armature: Object) -> list[Object]:
+    """
+    Imports the markers of the model.
+
+    Args:
+    - model: The model to import the markers from.
+    - armature: The armature to parent the markers to.
+
+    Returns:
+    - The list of imported markers (as empties)
+    """
+    return [point.create_empty() for point in get_marker_points(model, armature)]
+
+
+def import_marker_cloud(model: Model, points: list[MarkerPoint], armature: Object | None) -> Object:
+    """
+    Imports the markers of the model as the vertices of a single mesh. The marker names and bones
+    are stored as custom properties indexed by the `marker_index` attribute, and the marker
+    rotations in the `rotation` attribute.
+
+    Args:
+    - model: The model the markers belong to.
+    - points: The marker points to import.
+    - armature: The armature to parent the mesh to.
+
+    Returns:
+    - The marker mesh object.
+    """
+    props = get_model_options()
+    name = f"{model.header.tag_id}_Markers"
+    mesh = bpy.data.meshes.new(name)
+    positions = np.array(
+        [point.matrix_world.translation.to_tuple() for point in points], dtype=np.float32
+    ).reshape(-1, 3)
+    rotations = np.array(
+        [tuple(point.matrix_world.to_quaternion()) for point in points], dtype=np.float32
+    ).reshape(-1, 4)
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set("co", positions.ravel())
+    indices = mesh.attributes.new("marker_index", "INT", "POINT")
+    indices.data.foreach_set("value", np.arange(len(points), dtype=np.int32))
+    rotation = mesh.attributes.new("rotation", "QUATERNION", "POINT")
+    rotation.data.foreach_set("value", rotations.ravel())
+    mesh.update()
+
+    cloud = bpy.data.objects.new(name, mesh)
+    if armature:
+        cloud.parent = armature
+    else:
+        cloud.scale = Vector((FEET_TO_METER, FEET_TO_METER, FEET_TO_METER)) * Vector(
+            (props.scale_factor,) * 3
+        )
+    cloud.hide_render = True
+    cloud["is_marker"] = True
+    cloud["marker_names"] = [point.name for point in points]
+    cloud["marker_bones"] = [point.parent_bone for point in points]
+    if bpy.context.scene:
+        bpy.context.scene.collection.objects.link(cloud)
+    return cloud
@@ -5,17 +5,28 @@ from pathlib import Path
 from typing import cast
 
 import bpy
+import numpy as np
+import numpy.typing as npt
 from bpy.types import ArmatureModifier, Material, Mesh, Object
 from mathutils import Vector
 
 from ...constants import FEET_TO_METER
 from ...ui.model_options import get_model_options
+from ...utils import get_addon_preferences, get_model_cache_folder
+from ..binary_reader import BinaryReader
+from ..index_buffer import faces_are_valid, valid_face_mask
 from ..metadata import Model
+from ..model_cache import (
+    evict_model_cache,
+    get_cache_key,
+    has_model_cache,
+    load_model_cache,
+    save_model_cache,
+)
 from ..rtgo_offset import RtgoOffset
 from ..section import Section
-from ..vectors import NormalizedVector2
 from .bone import import_bones
-from .markers import import_markers
+from .markers import MarkerPoint, get_marker_points, import_marker_cloud, import_markers
 
 __all__ = ["ModelImporter"]
 
@@ -24,6 +35,8 @@ class ModelImporter:
     def __init__(self) -> None:
         self.model: Model = Model()
         self.markers: list[Object] = []
+        self.marker_points: list[MarkerPoint] = []
+        self.marker_cloud: Object | None = None
         self.rig: Object | None = None
 
     def start_import(
@@ -33,6 +46,9 @@ class ModelImporter:
         materials: list[int] | None = None,
         custom_rig: Object | None = None,
         excluded_materials: list[int] | None = None,
+        regions: list[int] | None = None,
+        permutations: list[int] | None = None,
+        decoded_model: Model | None = None,
     ) -> list[Object]:
         """
         Imports the model from the given path.
@@ -43,17 +59,25 @@ class ModelImporter:
         - materials: Optional list of materials to use (useful for RTGOs)
         - custom_rig: Optional custom rig to use.
         - excluded_materials: Optional list of materials that an object cannot contain
+        - regions: Optional list of region name ids to import, sections of other regions are never
+          decoded.
+        - permutations: Optional list of permutation name ids to import, sections of other
+          permutations are never decoded.
+        - decoded_model: Optional model that was already read from `model_path`, for example by
+          `prefetch_models`. It is used instead of reading the file again.
 
         Returns:
         - The list of imported objects.
         """
         options = get_model_options()
-        model = Path(model_path)
-        if not model.exists() or model.is_dir():
-            logging.warning(f"Model path does not exist: {model}")
-            return []
-        with open(model_path, "rb") as f:
-            self.model.read(f)
+        if decoded_model is not None:
+            self.model = decoded_model
+        else:
+            model = Path(model_path)
+            if not model.exists() or model.is_dir():
+                logging.warning(f"Model path does not exist: {model}")
+                return []
+            self._read_model(model, regions, permutations)
         if materials:
             self.model.materials = materials
         if options.import_bones and bones:
@@ -63,11 +87,14 @@ class ModelImporter:
                 self.rig.scale = Vector((FEET_TO_METER, FEET_TO_METER, FEET_TO_METER)) * Vector(scl)
             else:
                 self.rig = custom_rig
-            if options.import_markers:
+            if options.import_markers and options.compact_markers:
+                self.marker_points = get_marker_points(self.model, self.rig)
+                self.marker_cloud = import_marker_cloud(self.model, self.marker_points, self.rig)
+            elif options.import_markers:
                 self.markers = import_markers(self.model, self.rig)
-            objects = self._import_model()
+            objects = self._import_model(regions, permutations)
         else:
-            objects = self._import_model()
+            objects = self._import_model(regions, permutations)
         if excluded_materials:
             for i, object in enumerate(objects):
                 material_names = [x.material.name for x in object.material_slots if x.material]
@@ -76,10 +103,81 @@ class ModelImporter:
                         _ = objects.pop(i)
         return objects
 
+    def find_markers(self, name: str, alt_name: str) -> list[Object | MarkerPoint]:
+        """
+        Finds the imported markers named `name` or whose name contains `alt_name`. When markers
+        were imported in compact mode, the matching marker points are returned instead of empties.
+
+        Args:
+        - name: The exact name of the marker.
+        - alt_name: A part of the name of the marker.
+
+        Returns:
+        - The matching markers.
+        """
+        markers: list[Object] | list[MarkerPoint] = self.markers or self.marker_points
+        return [marker for marker in markers if marker.name == name or alt_name in marker.name]
+
+    def _read_model(
+        self, model_path: Path, regions: list[int] | None, permutations: list[int] | None
+    ) -> None:
+        """
+        Reads the model lazily. When the model cache has it, the decoded buffers of the sections
+        that will be imported are restored from the cache and only the header of the model file is
+        read from disk. Otherwise the whole file is read, and a model that is imported whole is
+        stored in the cache.
+
+        Args:
+        - model_path: The path to the model file.
+        - regions: Optional list of region name ids that will be imported.
+        - permutations: Optional list of permutation name ids that will be imported.
+        """
+        preferences = get_addon_preferences()
+        if not preferences.use_model_cache:
+            self.model.read(BinaryReader.from_file(model_path), lazy=True)
+            return
+        cache_folder = get_model_cache_folder()
+        key = get_cache_key(model_path)
+        if has_model_cache(cache_folder, key):
+            self.model.read(BinaryReader.map_file(model_path), lazy=True)
+            sections = [idx for idx, _ in self.model.get_sections(regions, permutations)]
+            if load_model_cache(self.model, cache_folder, key, sections):
+                return
+        else:
+            self.model.read(BinaryReader.from_file(model_path), lazy=True)
+        if regions is not None or permutations is not None:
+            return
+        save_model_cache(self.model, cache_folder, key)
+        evict_model_cache(cache_folder, preferences.model_cache_size * 1024 * 1024)
+
+    def _build_mesh(
+        self,
+        mesh: Mesh,
+        verts: npt.NDArray[np.float32],
+        faces: npt.NDArray[np.unsignedinteger],
+    ) -> None:
+        """
+        Fills the vertices, loops and triangles of an empty mesh straight from flat arrays.
+
+        Args:
+        - mesh: The mesh to fill.
+        - verts: The (n, 3) vertex positions.
+        - faces: The (n, 3) triangle vertex indices.
+        """
+        face_count = len(faces)
+        mesh.vertices.add(len(verts))
+        mesh.vertices.foreach_set("co", np.ascontiguousarray(verts, dtype=np.float32).ravel())
+        mesh.loops.add(face_count * 3)
+        mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(faces, dtype=np.int32).ravel())
+        mesh.polygons.add(face_count)
+        # Every polygon is a triangle, loop_total is derived from the loop starts
+        mesh.polygons.foreach_set("loop_start", np.arange(0, face_count * 3, 3, dtype=np.int32))
+        mesh.update(calc_edges=True)
+
     def _create_uv(
         self,
         mesh: Mesh,
-        uv: list[NormalizedVector2],
+        uv: npt.NDArray[np.float32],
         uv_scale: list[tuple[float, float, float]],
         index: int,
     ) -> None:
@@ -93,48 +191,52 @@ class ModelImporter:
         - uv_scale: The UV scale (compression) to apply.
         - index: The index of the UV layer.
         """
-        uv0 = [x.vector for x in uv]
         uv_layer = mesh.uv_layers.new(name=f"UV{index}")
-        for loop in range(len(mesh.loops)):
-            uv_layer.data[mesh.loops[loop].index].uv = (
-                uv0[mesh.loops[loop].vertex_index][0] * uv_scale[0][2] + uv_scale[0][0],
-                1 - (uv0[mesh.loops[loop].vertex_index][1] * uv_scale[1][2] + uv_scale[1][0]),
-            )
+        loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertices)
+
+        scale = np.array((uv_scale[0][2], uv_scale[1][2]), dtype=np.float32)
+        offset = np.array((uv_scale[0][0], uv_scale[1][0]), dtype=np.float32)
+        loop_uv = uv[loop_vertices] * scale + offset
+        loop_uv[:, 1] = 1.0 - loop_uv[:, 1]
+        uv_layer.data.foreach_set("uv", loop_uv.ravel())
 
-    def _create_material_indices(self, section: Section, mesh: Mesh) -> None:
+    def _create_material_indices(
+        self, section: Section, mesh: Mesh, face_starts: npt.NDArray[np.intp]
+    ) -> None:
         """
         Create material indices for the mesh. Assigns materials to the mesh based on the shader index of the submeshes.
 
         Args:
         - section: The section to create the material indices for.
         - mesh: The mesh to assign the materials to.
+        - face_starts: The position in the index array of the first index of every triangle of the
+          mesh.
         """
-        material_slots: dict[int, Material] = {}
-        material_slot_indices: dict[int, int] = {}
-        for submesh in range(len(section.submeshes)):
-            first_face = section.submeshes[submesh].index_start
-            face_count = section.submeshes[submesh].index_count
-            part_faces = mesh.polygons[first_face // 3 : (first_face + face_count) // 3]
-            if section.submeshes[submesh].shader_index >= len(self.model.materials):
+        slot_indices: dict[int, int] = {}
+        for shader_index in dict.fromkeys(submesh.shader_index for submesh in section.submeshes):
+            if shader_index >= len(self.model.materials):
                 continue
-            mat_name = str(self.model.materials[section.submeshes[submesh].shader_index])
+            mat_name = str(self.model.materials[shader_index])
             m = bpy.data.materials.get(mat_name)
             if not m:
                 m = bpy.data.materials.new(mat_name)
             m.use_nodes = True
             if m.name not in mesh.materials:
                 mesh.materials.append(m)
-            if len(mesh.materials) > 0:
-                mat = mesh.materials[-1]
-                if mat:
-                    material_slots[section.submeshes[submesh].shader_index] = mat
-                material_slot_indices[section.submeshes[submesh].shader_index] = len(
-                    material_slot_indices
-                )
-                for face in part_faces:
-                    face.material_index = material_slot_indices[
-                        section.submeshes[submesh].shader_index
-                    ]
+            slot_indices[shader_index] = mesh.materials.find(m.name)
+
+        # A triangle belongs to the submesh whose index range contains all three of its indices
+        material_indices = np.zeros(len(mesh.polygons), dtype=np.int32)
+        for submesh in section.submeshes:
+            slot_index = slot_indices.get(submesh.shader_index)
+            if slot_index is None:
+                continue
+            first, last = np.searchsorted(
+                face_starts, (submesh.index_start, submesh.index_start + submesh.index_count - 2)
+            )
+            material_indices[first:last] = slot_index
+        mesh.polygons.foreach_set("material_index", material_indices)
 
     def _create_skinning(
         self, obj: Object, name: str, armature: Object, section: Section, mesh: Mesh
@@ -157,38 +259,54 @@ class ModelImporter:
 
         modifier.object = armature
 
+        used_groups: set[int] = set()
         if section.node_index != 255 and section.node_index < len(self.model.bones):
             bone = self.model.bones[section.node_index]
             group = obj.vertex_groups.new(name=str(bone.name))
             group.add(range(vertex_count), 1.0, "REPLACE")
+            if vertex_count > 0:
+                used_groups.add(group.index)
         else:
             for bone in self.model.bones:
                 _ = obj.vertex_groups.new(name=str(bone.name))
-            for (
-                vi,
-                blend_indicies,
-                blend_weights,
-            ) in section.vertex_buffer.enumerate_blendpairs(section.vertex_type):
-                for bi, bw in zip(blend_indicies, blend_weights):
-                    if bi < len(obj.vertex_groups):
-                        obj.vertex_groups[bi].add([vi], bw, "REPLACE")
+            for bone_index, weight, vertices in section.vertex_buffer.get_weight_groups(
+                section.vertex_type, len(obj.vertex_groups)
+            ):
+                obj.vertex_groups[bone_index].add(vertices.tolist(), weight, "REPLACE")
+                used_groups.add(bone_index)
 
         # Removes that weird shading that happens when you twist a bone
-        for p in mesh.polygons:
-            p.use_smooth = True
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
 
         if options.remove_unused_groups:
-            used_groups = set()
-
-            for vertex in mesh.vertices:
-                for g in vertex.groups:
-                    if g.weight > 0.0:
-                        used_groups.add(g.group)
-
             for group in reversed(obj.vertex_groups):
                 if group.index not in used_groups:
                     obj.vertex_groups.remove(group)
 
+    def _create_shape_keys(
+        self, obj: Object, section: Section, mesh: Mesh, verts: npt.NDArray[np.float32]
+    ) -> None:
+        """
+        Create shape keys for the mesh from the blendshape buffers. Keys are only created for
+        targets that move at least one vertex.
+
+        Args:
+        - obj: The object to add the shape keys to.
+        - section: The section to create the shape keys for.
+        - mesh: The mesh of the object.
+        - verts: The vertex positions of the mesh.
+        """
+        basis = np.ascontiguousarray(verts, dtype=np.float32)
+        for target, vertices, deltas in section.vertex_buffer.get_shape_deltas(
+            self.model.blendshape_bounding_boxes
+        ):
+            if mesh.shape_keys is None:
+                _ = obj.shape_key_add(name="Basis", from_mix=False)
+            co = basis.copy()
+            np.add.at(co, vertices, deltas)
+            key = obj.shape_key_add(name=f"Target{target}", from_mix=False)
+            key.data.foreach_set("co", co.ravel())
+
     def _create_color(self, section: Section, mesh: Mesh) -> None:
         """
         Create vertex colors for the mesh. Assigns vertex colors to the mesh based on the color buffer.
@@ -197,23 +315,34 @@ class ModelImporter:
         - section: The section to create the vertex colors for.
         - mesh: The mesh to assign the vertex colors to.
         """
-        for i, color in enumerate(section.vertex_buffer.color_buffer.color):
-            ca = mesh.color_attributes.new(name=f"Color{i}", type="BYTE_COLOR", domain="FACE")
-            for loop in range(len(mesh.loops) // 3):
-                ca.data[loop].color = color  # ty: ignore[unresolved-attribute]
+        colors = section.vertex_buffer.color_buffer.rgba
+        if len(colors) == 0:
+            return
+        if len(colors) != len(mesh.vertices):
+            logging.warning(
+                f"Color buffer has {len(colors)} entries for {len(mesh.vertices)} vertices!"
+            )
+            return
+        ca = mesh.color_attributes.new(name="Color0", type="BYTE_COLOR", domain="POINT")
+        # The bytes are already sRGB encoded, so they are written without a colorspace conversion
+        ca.data.foreach_set("color_srgb", (colors / np.float32(255.0)).astype(np.float32).ravel())
 
-    def _create_normals(self, section: Section, mesh: Mesh) -> None:
+    def _create_normals(self, section: Section, mesh: Mesh, validate: bool = True) -> None:
         """
         Create normals for the mesh. Assigns normals to the mesh based on the normal buffer.
 
         Args:
         - section: The section to create the normals for.
         - mesh: The mesh to assign the normals to.
+        - validate: Whether to validate the whole mesh afterwards.
         """
-        normals = [x.vector.to_tuple() for x in section.vertex_buffer.normal_buffer.normals]
         mesh.shade_smooth()
+        normals = np.ascontiguousarray(
+            section.vertex_buffer.normal_buffer.normals, dtype=np.float32
+        )
         mesh.normals_split_custom_set_from_vertices(normals)
-        _ = mesh.validate()
+        if validate:
+            _ = mesh.validate()
         mesh.update()
 
     def _create_section(self, section: Section, offset: RtgoOffset | None = None) -> Object | None:
@@ -238,15 +367,21 @@ class ModelImporter:
         uv_scale1 = self.model.bounding_boxes[0].uv1_scale
         uv_scale2 = self.model.bounding_boxes[0].uv2_scale
 
-        verts = [x.vector for x in section.vertex_buffer.position_buffer.positions]
-        it = len(verts[0])
-        for i in range(len(verts)):
-            verts[i] = Vector(
-                [verts[i][j] * model_scale[j][-1] + model_scale[j][0] for j in range(it)]
-            )
+        positions = section.vertex_buffer.position_buffer.positions[:, :3]
+        verts = positions * np.array([x[2] for x in model_scale], dtype=np.float32) + np.array(
+            [x[0] for x in model_scale], dtype=np.float32
+        )
 
-        ind = section.index_buffer.indices
-        faces = [(ind[x], ind[x + 1], ind[x + 2]) for x in range(0, len(ind), 3)]
+        faces = section.index_buffer.faces
+        face_starts = section.index_buffer.face_starts
+        if not faces_are_valid(faces, len(verts)):
+            # Drop the broken triangles before the mesh is built, so the per-loop and per-polygon
+            # data written afterwards always matches the mesh
+            valid = valid_face_mask(faces, len(verts))
+            logging.warning(
+                f"Skipping {np.count_nonzero(~valid)} invalid triangles of {collection_name}"
+            )
+            faces, face_starts = faces[valid], face_starts[valid]
         mesh = bpy.data.meshes.new(collection_name)
         obj = bpy.data.objects.new(collection_name, mesh)
         obj["region_name"] = region_name
@@ -254,7 +389,7 @@ class ModelImporter:
         obj.scale = Vector((FEET_TO_METER, FEET_TO_METER, FEET_TO_METER)) * Vector(
             (options.scale_factor,) * 3
         )
-        mesh.from_pydata(verts, [], faces)
+        self._build_mesh(mesh, verts, faces)
         if section.vertex_flags.has_uv0:
             self._create_uv(mesh, section.vertex_buffer.uv0_buffer.uv, uv_scale, 0)
         if section.vertex_flags.has_uv1:
@@ -263,21 +398,30 @@ class ModelImporter:
             self._create_uv(mesh, section.vertex_buffer.uv2_buffer.uv, uv_scale2, 2)
 
         if options.import_materials:
-            self._create_material_indices(section, mesh)
+            self._create_material_indices(section, mesh, face_starts)
         if options.import_vertex_color:
             self._create_color(section, mesh)
         if self.rig and options.import_bones:
             self._create_skinning(obj, collection_name, self.rig, section, mesh)
+        if options.import_shape_keys and section.vertex_flags.has_blendshape_position:
+            self._create_shape_keys(obj, section, mesh, verts)
+        self._create_normals(section, mesh, options.strict_validation)
 
         if offset:
             obj.location = offset.position.vector
             obj["permutation_name"] = offset.name
         return obj
 
-    def _import_model(self) -> list[Object]:
+    def _import_model(
+        self, regions: list[int] | None = None, permutations: list[int] | None = None
+    ) -> list[Object]:
         """
         Imports the model by creating sections.
 
+        Args:
+        - regions: Optional list of region name ids to import.
+        - permutations: Optional list of permutation name ids to import.
+
         Returns:
         - The list of imported objects.
         """
@@ -291,13 +435,14 @@ class ModelImporter:
                 materials.append(mat)
         objects: list[Object] = []
 
-        for idx, section in enumerate(self.model.sections):
+        for idx, section in self.model.get_sections(regions, permutations):
             per_mesh_data = None
             per_mesh_datas = [pmd for pmd in self.model.offsets if pmd.mesh_index == idx]
             if per_mesh_datas != []:
                 per_mesh_data = per_mesh_datas[0]
             obj = self._create_section(section, per_mesh_data)
+            # The mesh holds its own copy of the data, so the decoded buffers can be released
+            section.unload()
             if obj:
-                self._create_normals(section, cast(Mesh, obj.data))
                 objects.append(obj)
         return objects
@@ -1,11 +1,14 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
 from enum import IntEnum
-from io import BufferedReader
+
+import numpy as np
+import numpy.typing as npt
 
 from ..exceptions import IncorrectStrideValue
+from .binary_reader import BinaryReader
 
-__all__ = ["IndexBuffer", "IndexBufferType"]
+__all__ = ["IndexBuffer", "IndexBufferType", "faces_are_valid", "valid_face_mask"]
 
 
 class IndexBufferType(IntEnum):
@@ -18,20 +21,129 @@ class IndexBufferType(IntEnum):
     QuadList = 6
 
 
+_INDEX_DTYPES: dict[int, str] = {2: "<u2", 4: "<u4"}
+
+
+def _expand_strip(
+    indices: npt.NDArray[np.unsignedinteger],
+) -> tuple[npt.NDArray[np.uint32], npt.NDArray[np.intp]]:
+    """
+    Expands a triangle strip into a triangle list, flipping the winding of every other triangle.
+    Degenerate triangles (used to stitch strips together) and triangles containing the primitive
+    restart index are dropped.
+
+    Args:
+    - indices: The strip indices.
+
+    Returns:
+    - A (n, 3) array of triangle indices.
+    - The position in the strip of the first index of every triangle.
+    """
+    if len(indices) < 3:
+        return np.empty((0, 3), dtype=np.uint32), np.empty(0, dtype=np.intp)
+    restart = np.iinfo(indices.dtype).max
+    strip = indices.astype(np.uint32)
+    faces = np.stack((strip[:-2], strip[1:-1], strip[2:]), axis=1)
+
+    # Winding alternates per triangle, starting over after every restart index
+    position = np.arange(len(strip))
+    strip_start = np.maximum.accumulate(np.where(strip == restart, position + 1, 0))
+    odd = (position[:-2] - strip_start[:-2]) % 2 == 1
+    faces[odd] = faces[odd][:, [0, 2, 1]]
+
+    valid = (
+        (faces[:, 0] != faces[:, 1])
+        & (faces[:, 1] != faces[:, 2])
+        & (faces[:, 0] != faces[:, 2])
+        & (faces != restart).all(axis=1)
+    )
+    return faces[valid], np.flatnonzero(valid)
+
+
+def faces_are_valid(faces: npt.NDArray[np.unsignedinteger], vertex_count: int) -> bool:
+    """
+    Cheaply checks that triangles only reference existing vertices and are not degenerate.
+
+    Args:
+    - faces: The (n, 3) triangle indices.
+    - vertex_count: The number of vertices the triangles index into.
+
+    Returns:
+    - Whether all triangles are valid.
+    """
+    if len(faces) == 0:
+        return True
+    if int(faces.max()) >= vertex_count:
+        return False
+    return not (
+        (faces[:, 0] == faces[:, 1]) | (faces[:, 1] == faces[:, 2]) | (faces[:, 0] == faces[:, 2])
+    ).any()
+
+
+def valid_face_mask(
+    faces: npt.NDArray[np.unsignedinteger], vertex_count: int
+) -> npt.NDArray[np.bool_]:
+    """
+    Finds the triangles that only reference existing vertices and are not degenerate.
+
+    Args:
+    - faces: The (n, 3) triangle indices.
+    - vertex_count: The number of vertices the triangles index into.
+
+    Returns:
+    - A (n,) mask of the valid triangles.
+    """
+    return (
+        (faces < vertex_count).all(axis=1)
+        & (faces[:, 0] != faces[:, 1])
+        & (faces[:, 1] != faces[:, 2])
+        & (faces[:, 0] != faces[:, 2])
+    )
+
+
 class IndexBuffer:
     def __init__(self) -> None:
         self.index_buffer_type: IndexBufferType = IndexBufferType.Default
         self.stride: int = -1
         self.count: int = 0
-        self.indices: list[int] = []
-
-    def read(self, reader: BufferedReader) -> None:
-        self.index_buffer_type = IndexBufferType(int.from_bytes(reader.read(1), "little"))
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
-        if self.stride % 2 != 0:
-            raise IncorrectStrideValue("Index buffer stride was not a multiple of 2!")
-
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            index = int.from_bytes(reader.read(self.stride), "little")
-            self.indices.append(index)
+        self.indices: npt.NDArray[np.unsignedinteger] = np.empty(0, dtype=np.uint16)
+        # The expanded strip along with the index array it was expanded from
+        self._strip: (
+            tuple[npt.NDArray[np.unsignedinteger], npt.NDArray[np.uint32], npt.NDArray[np.intp]]
+            | None
+        ) = None
+
+    def read(self, reader: BinaryReader) -> None:
+        self.index_buffer_type = IndexBufferType(reader.read_u8())
+        self.stride = reader.read_i8()
+        if self.stride not in _INDEX_DTYPES:
+            raise IncorrectStrideValue("Index buffer stride was not 2 or 4!")
+
+        self.count = reader.read_u32()
+        self.indices = reader.read_array(_INDEX_DTYPES[self.stride], self.count)
+
+    def _get_strip(self) -> tuple[npt.NDArray[np.uint32], npt.NDArray[np.intp]]:
+        if self._strip is None or self._strip[0] is not self.indices:
+            faces, starts = _expand_strip(self.indices)
+            self._strip = (self.indices, faces, starts)
+        return self._strip[1], self._strip[2]
+
+    @property
+    def faces(self) -> npt.NDArray[np.unsignedinteger]:
+        """
+        The triangles of the index buffer as a (n, 3) array. Triangle lists are returned as a view
+        of the index array, triangle strips are expanded into a new list once.
+        """
+        if self.index_buffer_type == IndexBufferType.TriangleStrip:
+            return self._get_strip()[0]
+        face_count = len(self.indices) // 3
+        return self.indices[: face_count * 3].reshape(face_count, 3)
+
+    @property
+    def face_starts(self) -> npt.NDArray[np.intp]:
+        """
+        The position in the index array of the first index of every triangle in `faces`.
+        """
+        if self.index_buffer_type == IndexBufferType.TriangleStrip:
+            return self._get_strip()[1]
+        return np.arange(len(self.indices) // 3, dtype=np.intp) * 3
@@ -1,11 +1,14 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+import struct
 
+from .binary_reader import BinaryReader
 from .vectors import Vector3, Vector4
 
 __all__ = ["MarkerInstance", "Marker"]
 
+_INSTANCE = struct.Struct("<biB")
+
 
 class MarkerInstance:
     def __init__(self) -> None:
@@ -15,12 +18,10 @@ class MarkerInstance:
         self.permutation_index: int = -1
         self.node_index: int = -1
 
-    def read(self, reader: BufferedReader) -> None:
+    def read(self, reader: BinaryReader) -> None:
         self.position.read(reader)
         self.rotation.read(reader)
-        self.region_index = int.from_bytes(reader.read(1), byteorder="little", signed=True)
-        self.permutation_index = int.from_bytes(reader.read(4), byteorder="little", signed=True)
-        self.node_index = int.from_bytes(reader.read(1), byteorder="little", signed=False)
+        self.region_index, self.permutation_index, self.node_index = reader.unpack(_INSTANCE)
 
 
 class Marker:
@@ -29,10 +30,9 @@ class Marker:
         self.instance_count: int = 0
         self.instances: list[MarkerInstance] = []
 
-    def read(self, reader: BufferedReader) -> None:
-        name_length = int.from_bytes(reader.read(1), "little")
-        self.name = reader.read(name_length).decode("utf-8")
-        self.instance_count = int.from_bytes(reader.read(4), byteorder="little", signed=True)
+    def read(self, reader: BinaryReader) -> None:
+        self.name = reader.read_string()
+        self.instance_count = reader.read_i32()
         for _ in range(self.instance_count):
             instance = MarkerInstance()
             instance.read(reader)
@@ -1,7 +1,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+from mathutils import Matrix
 
+from .binary_reader import BinaryReader
 from .blendshape_bounding_box_buffer import BlendShapeBoundingBox
 from .bone import Bone
 from .bounding_box import BoundingBox
@@ -25,8 +26,17 @@ class Model:
         self.materials: list[int] = []
         self.sections: list[Section] = []
         self.blendshape_bounding_boxes: list[BlendShapeBoundingBox] = []
+        self.bone_transforms: list[Matrix] | None = None
 
-    def read(self, reader: BufferedReader) -> None:
+    def read(self, reader: BinaryReader, lazy: bool = False) -> None:
+        """
+        Reads the model from the reader.
+
+        Args:
+        - reader: The reader positioned at the start of the model.
+        - lazy: Whether to defer decoding the index and vertex buffers of each section until the
+          section is first used.
+        """
         self.header.read(reader)
         for _ in range(self.header.region_count):
             region = Region()
@@ -49,7 +59,7 @@ class Model:
             offset.read(reader)
             self.offsets.append(offset)
         for _ in range(self.header.material_count):
-            material = int.from_bytes(reader.read(4), "little", signed=True)
+            material = reader.read_i32()
             self.materials.append(material)
         for _ in range(self.header.blendshape_bounding_box_count):
             blendshape_bounding_box = BlendShapeBoundingBox()
@@ -57,5 +67,26 @@ class Model:
             self.blendshape_bounding_boxes.append(blendshape_bounding_box)
         for _ in range(self.header.section_count):
             section = Section()
-            section.read(reader)
+            section.read(reader, lazy)
             self.sections.append(section)
+
+    def get_sections(
+        self, regions: list[int] | None = None, permutations: list[int] | None = None
+    ) -> list[tuple[int, Section]]:
+        """
+        Gets the sections belonging to the given regions and permutations, without decoding them.
+
+        Args:
+        - regions: Optional list of region name ids to keep, all regions are kept if not given.
+        - permutations: Optional list of permutation name ids to keep, all permutations are kept
+          if not given.
+
+        Returns:
+        - The list of (section index, section) pairs.
+        """
+        return [
+            (idx, section)
+            for idx, section in enumerate(self.sections)
+            if (regions is None or section.region_name in regions)
+            and (permutations is None or section.permutation_name in permutations)
+        ]
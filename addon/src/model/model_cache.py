@@ -0,0 +1,214 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2026 The Halo Archive
+import hashlib
+import logging
+import os
+import threading
+import zipfile
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from ..constants import version_string
+from .index_buffer import IndexBuffer, IndexBufferType
+from .metadata import Model
+from .vertex_buffer import VertexBuffers
+
+__all__ = [
+    "evict_model_cache",
+    "get_cache_key",
+    "has_model_cache",
+    "load_model_cache",
+    "save_model_cache",
+]
+
+_MAGIC = np.frombuffer(b"SURA", dtype=np.uint8)
+
+# The decoded arrays stored for each vertex buffer, along with the flag that marks it as present
+_VERTEX_BUFFERS: tuple[tuple[str, str, tuple[str, ...]], ...] = (
+    ("position_buffer", "has_position", ("positions",)),
+    ("uv0_buffer", "has_uv0", ("uv",)),
+    ("uv1_buffer", "has_uv1", ("uv",)),
+    ("uv2_buffer", "has_uv2", ("uv",)),
+    ("normal_buffer", "has_normal", ("normals",)),
+    ("color_buffer", "has_color", ("color",)),
+    ("weight_index_buffer", "has_blend_indices", ("indices",)),
+    ("weight_buffer", "has_blend_weights", ("weights",)),
+    ("weight_extra_buffer", "has_blend_weights_extra", ("values",)),
+    ("blendshape_index_buffer", "has_blendshape_index", ("indices",)),
+    (
+        "blendshape_position_buffer",
+        "has_blendshape_position",
+        ("deltas", "order", "targets", "target_offsets"),
+    ),
+)
+
+
+def get_cache_key(model_path: str | Path) -> str:
+    """
+    Gets the cache key of a model file, made from its path, size and modification time.
+
+    Args:
+    - model_path: The path to the model file.
+
+    Returns:
+    - The cache key.
+    """
+    path = Path(model_path).resolve()
+    stat = path.stat()
+    key = f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{version_string}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _cache_file(cache_folder: str | Path, key: str) -> Path:
+    return Path(cache_folder) / f"{key}.npz"
+
+
+def has_model_cache(cache_folder: str | Path, key: str) -> bool:
+    """
+    Checks whether the cache has an entry for a model, without validating it.
+
+    Args:
+    - cache_folder: The folder holding the cache.
+    - key: The cache key of the model file.
+
+    Returns:
+    - Whether an entry exists.
+    """
+    return _cache_file(cache_folder, key).is_file()
+
+
+def load_model_cache(
+    model: Model, cache_folder: str | Path, key: str, sections: Iterable[int] | None = None
+) -> bool:
+    """
+    Restores the decoded buffers of the sections of a model from the cache. The model must already
+    have been read, lazily or not.
+
+    Args:
+    - model: The model to restore the buffers of.
+    - cache_folder: The folder holding the cache.
+    - key: The cache key of the model file.
+    - sections: Optional indices of the sections to restore, all sections are restored if not
+      given. The buffers of the other sections are not read from the cache.
+
+    Returns:
+    - Whether the model was found in the cache.
+    """
+    if model.header.magic != "SURA":
+        return False
+    path = _cache_file(cache_folder, key)
+    if not path.is_file():
+        return False
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if not np.array_equal(data["magic"], _MAGIC):
+                return False
+            if int(data["section_count"]) != len(model.sections):
+                return False
+            indices = range(len(model.sections)) if sections is None else sections
+            for i in indices:
+                section = model.sections[i]
+                index_buffer = IndexBuffer()
+                index_buffer.index_buffer_type = IndexBufferType(int(data[f"{i}/index/type"]))
+                index_buffer.stride = int(data[f"{i}/index/stride"])
+                index_buffer.indices = data[f"{i}/index/indices"]
+                index_buffer.count = len(index_buffer.indices)
+
+                vertex_buffer = VertexBuffers()
+                vertex_buffer.flags = section.vertex_flags
+                for name, flag, fields in _VERTEX_BUFFERS:
+                    if not getattr(section.vertex_flags, flag):
+                        continue
+                    buffer = getattr(vertex_buffer, name)
+                    buffer.stride = int(data[f"{i}/{name}/stride"])
+                    buffer.count = int(data[f"{i}/{name}/count"])
+                    for field in fields:
+                        setattr(buffer, field, data[f"{i}/{name}/{field}"])
+                section.set_buffers(index_buffer, vertex_buffer)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        logging.warning(f"Discarding invalid model cache entry {path}: {e}")
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return False
+
+    # Refresh the entry so it is evicted last, it may have just been evicted by another import
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return True
+
+
+def save_model_cache(model: Model, cache_folder: str | Path, key: str) -> None:
+    """
+    Writes the decoded buffers of every section of a model to the cache. Sections that were read
+    lazily are decoded first. The cache is not trimmed, see `evict_model_cache`.
+
+    Args:
+    - model: The model to store.
+    - cache_folder: The folder holding the cache.
+    - key: The cache key of the model file.
+    """
+    if model.header.magic != "SURA":
+        return
+    arrays: dict[str, npt.ArrayLike] = {
+        "magic": _MAGIC,
+        "section_count": np.array(len(model.sections)),
+    }
+    for i, section in enumerate(model.sections):
+        index_buffer = section.index_buffer
+        arrays[f"{i}/index/type"] = np.array(int(index_buffer.index_buffer_type))
+        arrays[f"{i}/index/stride"] = np.array(index_buffer.stride)
+        arrays[f"{i}/index/indices"] = index_buffer.indices
+        for name, flag, fields in _VERTEX_BUFFERS:
+            if not getattr(section.vertex_flags, flag):
+                continue
+            buffer = getattr(section.vertex_buffer, name)
+            arrays[f"{i}/{name}/stride"] = np.array(buffer.stride)
+            arrays[f"{i}/{name}/count"] = np.array(buffer.count)
+            for field in fields:
+                arrays[f"{i}/{name}/{field}"] = getattr(buffer, field)
+
+    folder = Path(cache_folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    path = _cache_file(folder, key)
+    temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logging.warning(f"Failed to write model cache entry {path}: {e}")
+        temp_path.unlink(missing_ok=True)
+
+
+def evict_model_cache(cache_folder: str | Path, max_size: int) -> None:
+    """
+    Removes the least recently used entries of the cache until it fits in the given size. Every
+    entry is listed, so call it once after storing a batch of models rather than after each one.
+
+    Args:
+    - cache_folder: The folder holding the cache.
+    - max_size: The size limit of the cache in bytes.
+    """
+    entries: list[tuple[float, int, Path]] = []
+    for path in Path(cache_folder).glob("*.npz"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            continue
+        total -= size
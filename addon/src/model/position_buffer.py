@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
 from ..exceptions import IncorrectStrideValue
+from .binary_reader import BinaryReader
 from .vectors import NormalizedVector4
 
 __all__ = ["PositionBuffer"]
@@ -12,14 +14,11 @@ class PositionBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.positions: list[NormalizedVector4] = []
+        self.positions: npt.NDArray[np.float32] = np.empty((0, 4), dtype=np.float32)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: BinaryReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 8:
             raise IncorrectStrideValue("Position buffer stride was not 8!")
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            position = NormalizedVector4()
-            position.read(reader)
-            self.positions.append(position)
+        self.count = reader.read_u32()
+        self.positions = NormalizedVector4.read_array(reader, self.count)
@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2026 The Halo Archive
+import logging
+import struct
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from ..exceptions import IncorrectStrideValue
+from .binary_reader import BinaryReader
+from .metadata import Model
+from .model_cache import (
+    evict_model_cache,
+    get_cache_key,
+    has_model_cache,
+    load_model_cache,
+    save_model_cache,
+)
+
+__all__ = ["decode_model", "prefetch_models"]
+
+
+def decode_model(model_path: str | Path, cache_folder: str | Path | None = None) -> Model:
+    """
+    Reads a model and decodes the buffers of all of its sections. Only numpy arrays are created,
+    so it is safe to call outside of Blender's main thread.
+
+    Args:
+    - model_path: The path to the model file.
+    - cache_folder: Optional model cache folder to restore the buffers from, the model is stored
+      in it when it isn't cached yet.
+
+    Returns:
+    - The decoded model.
+    """
+    model = Model()
+    if cache_folder is None:
+        model.read(BinaryReader.from_file(model_path), lazy=True)
+    else:
+        key = get_cache_key(model_path)
+        cached = has_model_cache(cache_folder, key)
+        # The buffers of a cached model come from the cache, so only its header is read from disk
+        reader = BinaryReader.map_file(model_path) if cached else BinaryReader.from_file(model_path)
+        model.read(reader, lazy=True)
+        if not (cached and load_model_cache(model, cache_folder, key)):
+            save_model_cache(model, cache_folder, key)
+    for section in model.sections:
+        section.load()
+    return model
+
+
+def prefetch_models[K](
+    model_paths: Iterable[tuple[K, str | Path]],
+    workers: int | None = None,
+    cache_folder: str | Path | None = None,
+    max_cache_size: int | None = None,
+) -> Iterator[tuple[K, Model | None]]:
+    """
+    Decodes models in a thread pool and yields them in the order they finish. Most of the decoding
+    happens in numpy and file reads, which release the GIL, so the files are decoded in parallel
+    while the caller builds the Blender data of the models that are already done.
+
+    Args:
+    - model_paths: The models to decode, as pairs of a key identifying the model and its path.
+    - workers: Optional number of worker threads.
+    - cache_folder: Optional model cache folder, see `decode_model`.
+    - max_cache_size: Optional size limit of the cache in bytes, it is trimmed once all of the
+      models have been decoded.
+
+    Returns:
+    - The key of each model with the decoded model, or None if it could not be read.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures: dict[Future[Model], tuple[K, str | Path]] = {
+            executor.submit(decode_model, path, cache_folder): (key, path)
+            for key, path in model_paths
+        }
+        try:
+            for future in as_completed(futures):
+                key, path = futures[future]
+                try:
+                    yield key, future.result()
+                except (OSError, ValueError, EOFError, struct.error, IncorrectStrideValue) as e:
+                    logging.warning(f"Failed to decode model {path}: {e}")
+                    yield key, None
+        finally:
+            for future in futures:
+                _ = future.cancel()
+    if cache_folder is not None and max_cache_size is not None:
+        evict_model_cache(cache_folder, max_cache_size)
@@ -1,9 +1,14 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+import struct
+
+from .binary_reader import BinaryReader
 
 __all__ = ["Permutation"]
 
+_PERMUTATION = struct.Struct("<iHH")
+_REGION = struct.Struct("<iI")
+
 
 class Permutation:
     def __init__(self) -> None:
@@ -11,10 +16,8 @@ class Permutation:
         self.section_count: int = 0
         self.section_index: int = 0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.name = int.from_bytes(reader.read(4), "little", signed=True)
-        self.section_count = int.from_bytes(reader.read(2), "little")
-        self.section_index = int.from_bytes(reader.read(2), "little")
+    def read(self, reader: BinaryReader) -> None:
+        self.name, self.section_count, self.section_index = reader.unpack(_PERMUTATION)
 
 
 class Region:
@@ -23,9 +26,8 @@ class Region:
         self.permutation_count: int = 0
         self.permutations: list[Permutation] = []
 
-    def read(self, reader: BufferedReader) -> None:
-        self.name = int.from_bytes(reader.read(4), "little", signed=True)
-        self.permutation_count = int.from_bytes(reader.read(4), "little")
+    def read(self, reader: BinaryReader) -> None:
+        self.name, self.permutation_count = reader.unpack(_REGION)
         for _ in range(self.permutation_count):
             permutation = Permutation()
             permutation.read(reader)
@@ -1,11 +1,14 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+import struct
 
+from .binary_reader import BinaryReader
 from .vectors import Vector3
 
 __all__ = ["RtgoOffset"]
 
+_OFFSET = struct.Struct("<ih")
+
 
 class RtgoOffset:
     def __init__(self) -> None:
@@ -13,7 +16,6 @@ class RtgoOffset:
         self.mesh_index: int = 0
         self.position: Vector3 = Vector3()
 
-    def read(self, reader: BufferedReader) -> None:
-        self.name = int.from_bytes(reader.read(4), "little", signed=True)
-        self.mesh_index = int.from_bytes(reader.read(2), "little", signed=True)
+    def read(self, reader: BinaryReader) -> None:
+        self.name, self.mesh_index = reader.unpack(_OFFSET)
         self.position.read(reader)
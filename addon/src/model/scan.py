@@ -0,0 +1,223 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2026 The Halo Archive
+import json
+import logging
+import os
+import struct
+import traceback
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+
+from ..exceptions import IncorrectStrideValue
+from ..json_definitions import ModelCatalogue, ModelSummary, ModelSummaryRegion
+from .binary_reader import BinaryReader
+from .metadata import Model
+
+__all__ = [
+    "CATALOGUE_VERSION",
+    "build_catalogue",
+    "find_models_with_material",
+    "find_models_with_permutation",
+    "read_catalogue",
+    "scan_model",
+    "scan_model_bounds",
+]
+
+CATALOGUE_VERSION = 1
+MODEL_FOLDERS = ("models", "runtime_geo")
+
+
+def _read_mapped[T](path: str | Path, read: Callable[[BinaryReader, os.stat_result], T]) -> T:
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            raise EOFError(f"Model file is empty: {path}")
+        with mmap(f.fileno(), 0, access=ACCESS_READ) as data:
+            reader = BinaryReader(data)
+            try:
+                return read(reader, stat)
+            except Exception as e:
+                # The frames of a failed read still reference views of the map, which would stop
+                # it from closing and hide the actual error
+                traceback.clear_frames(e.__traceback__)
+                raise
+            finally:
+                reader.data.release()
+
+
+def _summarize(reader: BinaryReader, stat: os.stat_result) -> ModelSummary:
+    model = Model()
+    model.read(reader, lazy=True)
+    regions: list[ModelSummaryRegion] = [
+        {"name": region.name, "permutations": [perm.name for perm in region.permutations]}
+        for region in model.regions
+    ]
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "tag_id": model.header.tag_id,
+        "is_rtgo": model.header.is_rtgo,
+        "regions": regions,
+        "materials": model.materials,
+        "section_count": len(model.sections),
+        "vertex_count": sum(section.vertex_count for section in model.sections),
+        "index_count": sum(section.index_count for section in model.sections),
+    }
+
+
+def _read_bounds(
+    reader: BinaryReader, _stat: os.stat_result
+) -> tuple[tuple[float, float, float], tuple[float, float, float]] | None:
+    model = Model()
+    model.read(reader, lazy=True)
+    if len(model.bounding_boxes) == 0:
+        return None
+    box = model.bounding_boxes[0]
+    return (
+        (box.x_bounds.min, box.y_bounds.min, box.z_bounds.min),
+        (box.x_bounds.max, box.y_bounds.max, box.z_bounds.max),
+    )
+
+
+def scan_model(path: str | Path) -> ModelSummary:
+    """
+    Reads the header, regions, materials and section headers of a model without decoding any of its
+    buffers. The file is memory mapped, so the skipped vertex and index data is never read from
+    disk.
+
+    Args:
+    - path: The path to the model file.
+
+    Returns:
+    - The summary of the model.
+    """
+    return _read_mapped(path, _summarize)
+
+
+def scan_model_bounds(
+    path: str | Path,
+) -> tuple[tuple[float, float, float], tuple[float, float, float]] | None:
+    """
+    Reads the bounds of a model's vertex positions without decoding any of its buffers.
+
+    Args:
+    - path: The path to the model file.
+
+    Returns:
+    - The minimum and maximum corner of the bounds, or None if the model has no bounding box.
+    """
+    return _read_mapped(path, _read_bounds)
+
+
+def _iter_model_files(data_folder: Path) -> Iterator[tuple[str, Path]]:
+    for folder in MODEL_FOLDERS:
+        root = data_folder / folder
+        if not root.is_dir():
+            continue
+        for path in root.glob("*.ekur"):
+            yield f"{folder}/{path.name}", path
+
+
+def read_catalogue(catalogue_path: str | Path) -> ModelCatalogue | None:
+    """
+    Loads a catalogue written by `build_catalogue`.
+
+    Args:
+    - catalogue_path: The path to the catalogue file.
+
+    Returns:
+    - The catalogue, or None if it does not exist or was written by another version.
+    """
+    path = Path(catalogue_path)
+    if not path.is_file():
+        return None
+    with open(path, "r") as f:
+        catalogue: ModelCatalogue = json.load(f)
+    if catalogue.get("version") != CATALOGUE_VERSION:
+        return None
+    return catalogue
+
+
+def build_catalogue(
+    data_folder: str | Path, catalogue_path: str | Path, workers: int | None = None
+) -> ModelCatalogue:
+    """
+    Scans every model in the `models` and `runtime_geo` folders of the data folder and writes their
+    summaries to a single compact json file. Entries of an existing catalogue are reused for files
+    whose size and modification time did not change.
+
+    Args:
+    - data_folder: The path to the data folder.
+    - catalogue_path: The path to write the catalogue to.
+    - workers: Optional number of worker threads to scan with.
+
+    Returns:
+    - The catalogue.
+    """
+    previous = read_catalogue(catalogue_path)
+    previous_models = previous["models"] if previous else {}
+    models: dict[str, ModelSummary] = {}
+    pending: list[tuple[str, Path]] = []
+    for key, path in _iter_model_files(Path(data_folder)):
+        cached = previous_models.get(key)
+        if cached is not None:
+            stat = path.stat()
+            if cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+                models[key] = cached
+                continue
+        pending.append((key, path))
+
+    def scan(entry: tuple[str, Path]) -> tuple[str, ModelSummary | None]:
+        key, path = entry
+        try:
+            return key, scan_model(path)
+        except (OSError, ValueError, EOFError, struct.error, IncorrectStrideValue) as e:
+            logging.warning(f"Failed to scan model {path}: {e}")
+            return key, None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for key, summary in executor.map(scan, pending):
+            if summary is not None:
+                models[key] = summary
+
+    catalogue: ModelCatalogue = {
+        "version": CATALOGUE_VERSION,
+        "models": dict(sorted(models.items())),
+    }
+    with open(catalogue_path, "w") as f:
+        json.dump(catalogue, f, separators=(",", ":"))
+    return catalogue
+
+
+def find_models_with_material(catalogue: ModelCatalogue, material: int) -> list[str]:
+    """
+    Gets the catalogued models that use the given material.
+
+    Args:
+    - catalogue: The catalogue to search.
+    - material: The material id.
+
+    Returns:
+    - The paths of the models, relative to the data folder.
+    """
+    return [key for key, model in catalogue["models"].items() if material in model["materials"]]
+
+
+def find_models_with_permutation(catalogue: ModelCatalogue, permutation: int) -> list[str]:
+    """
+    Gets the catalogued models that contain the given permutation in any of their regions.
+
+    Args:
+    - catalogue: The catalogue to search.
+    - permutation: The permutation name.
+
+    Returns:
+    - The paths of the models, relative to the data folder.
+    """
+    return [
+        key
+        for key, model in catalogue["models"].items()
+        if any(permutation in region["permutations"] for region in model["regions"])
+    ]
@@ -1,7 +1,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+import struct
 
+from .binary_reader import BinaryReader
 from .buffer_flags import BufferFlags
 from .index_buffer import IndexBuffer
 from .submesh import Submesh
@@ -10,6 +11,15 @@ from .vertex_type import VertexType
 
 __all__ = ["Section"]
 
+_SECTION = struct.Struct("<iiIBBB")
+_BUFFER = struct.Struct("<bI")
+
+
+def _skip_buffer(reader: BinaryReader) -> int:
+    stride, count = reader.unpack(_BUFFER)
+    reader.skip(stride * count)
+    return count
+
 
 class Section:
     def __init__(self) -> None:
@@ -20,21 +30,98 @@ class Section:
         self.vertex_type: VertexType = VertexType.World
         self.use_dual_quat: bool = False
         self.submeshes: list[Submesh] = []
-        self.index_buffer: IndexBuffer = IndexBuffer()
         self.vertex_flags: BufferFlags = BufferFlags()
-        self.vertex_buffer: VertexBuffers = VertexBuffers()
-
-    def read(self, reader: BufferedReader) -> None:
-        self.region_name = int.from_bytes(reader.read(4), "little", signed=True)
-        self.permutation_name = int.from_bytes(reader.read(4), "little", signed=True)
-        self.submesh_count = int.from_bytes(reader.read(4), "little")
-        self.node_index = int.from_bytes(reader.read(1), "little", signed=False)
-        self.vertex_type = VertexType(int.from_bytes(reader.read(1), "little"))
-        self.use_dual_quat = bool(int.from_bytes(reader.read(1), "little"))
+        self.index_count: int = 0
+        self.vertex_count: int = 0
+        self.index_buffer_offset: int = -1
+        self.vertex_buffer_offset: int = -1
+        self._reader: BinaryReader | None = None
+        self._index_buffer: IndexBuffer | None = None
+        self._vertex_buffer: VertexBuffers | None = None
+
+    def read(self, reader: BinaryReader, lazy: bool = False) -> None:
+        """
+        Reads the section from the reader.
+
+        Args:
+        - reader: The reader positioned at the start of the section.
+        - lazy: Whether to only record where the index and vertex buffers are instead of decoding
+          them. They are then decoded the first time `index_buffer` or `vertex_buffer` is accessed.
+        """
+        (
+            self.region_name,
+            self.permutation_name,
+            self.submesh_count,
+            self.node_index,
+            vertex_type,
+            use_dual_quat,
+        ) = reader.unpack(_SECTION)
+        self.vertex_type = VertexType(vertex_type)
+        self.use_dual_quat = bool(use_dual_quat)
         for _ in range(self.submesh_count):
             submesh = Submesh()
             submesh.read(reader)
             self.submeshes.append(submesh)
-        self.index_buffer.read(reader)
+
+        self.index_buffer_offset = reader.offset
+        if not lazy:
+            self._index_buffer = IndexBuffer()
+            self._index_buffer.read(reader)
+            self.vertex_flags.read(reader)
+            self.vertex_buffer_offset = reader.offset
+            self._vertex_buffer = VertexBuffers()
+            self._vertex_buffer.read(reader, self.vertex_flags)
+            self.index_count = self._index_buffer.count
+            self.vertex_count = self._vertex_buffer.position_buffer.count
+            return
+
+        self._reader = reader
+        reader.skip(1)  # Index buffer type
+        self.index_count = _skip_buffer(reader)
         self.vertex_flags.read(reader)
-        self.vertex_buffer.read(reader, self.vertex_flags)
+        self.vertex_buffer_offset = reader.offset
+        for i in range(self.vertex_flags.buffer_count):
+            count = _skip_buffer(reader)
+            # The position buffer is always the first one
+            if i == 0 and self.vertex_flags.has_position:
+                self.vertex_count = count
+
+    @property
+    def index_buffer(self) -> IndexBuffer:
+        if self._index_buffer is None:
+            self._index_buffer = IndexBuffer()
+            if self._reader is not None:
+                self._index_buffer.read(self._reader.at(self.index_buffer_offset))
+        return self._index_buffer
+
+    @property
+    def vertex_buffer(self) -> VertexBuffers:
+        if self._vertex_buffer is None:
+            self._vertex_buffer = VertexBuffers()
+            if self._reader is not None:
+                self._vertex_buffer.read(
+                    self._reader.at(self.vertex_buffer_offset), self.vertex_flags
+                )
+        return self._vertex_buffer
+
+    def set_buffers(self, index_buffer: IndexBuffer, vertex_buffer: VertexBuffers) -> None:
+        """
+        Sets already decoded buffers for the section, for example ones restored from a cache.
+        """
+        self._index_buffer = index_buffer
+        self._vertex_buffer = vertex_buffer
+
+    def load(self) -> None:
+        """
+        Decodes the buffers of a lazily read section if they haven't been decoded yet.
+        """
+        _ = self.index_buffer
+        _ = self.vertex_buffer
+
+    def unload(self) -> None:
+        """
+        Drops the decoded buffers of a lazily read section, they are decoded again on next access.
+        """
+        if self._reader is not None:
+            self._index_buffer = None
+            self._vertex_buffer = None
@@ -1,9 +1,13 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+import struct
+
+from .binary_reader import BinaryReader
 
 __all__ = ["Submesh"]
 
+_SUBMESH = struct.Struct("<iiHHhh")
+
 
 class Submesh:
     def __init__(self) -> None:
@@ -14,10 +18,12 @@ class Submesh:
         self.subset_index: int = -1
         self.shader_index: int = -1
 
-    def read(self, reader: BufferedReader) -> None:
-        self.index_count = int.from_bytes(reader.read(4), "little", signed=True)
-        self.index_start = int.from_bytes(reader.read(4), "little", signed=True)
-        self.vertex_count = int.from_bytes(reader.read(2), "little")
-        self.subset_count = int.from_bytes(reader.read(2), "little")
-        self.subset_index = int.from_bytes(reader.read(2), "little", signed=True)
-        self.shader_index = int.from_bytes(reader.read(2), "little", signed=True)
+    def read(self, reader: BinaryReader) -> None:
+        (
+            self.index_count,
+            self.index_start,
+            self.vertex_count,
+            self.subset_count,
+            self.subset_index,
+            self.shader_index,
+        ) = reader.unpack(_SUBMESH)
@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
 from ..exceptions import IncorrectStrideValue
+from .binary_reader import BinaryReader
 from .vectors import NormalizedVector2
 
 __all__ = ["UVBuffer"]
@@ -12,14 +14,11 @@ class UVBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.uv: list[NormalizedVector2] = []
+        self.uv: npt.NDArray[np.float32] = np.empty((0, 2), dtype=np.float32)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: BinaryReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 4:
             raise IncorrectStrideValue("UV buffer stride was not 4!")
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            uv = NormalizedVector2()
-            uv.read(reader)
-            self.uv.append(uv)
+        self.count = reader.read_u32()
+        self.uv = NormalizedVector2.read_array(reader, self.count)
@@ -1,11 +1,13 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
 import struct
-from io import BufferedReader
-from typing import cast
 
+import numpy as np
+import numpy.typing as npt
 from mathutils import Matrix, Vector
 
+from .binary_reader import BinaryReader
+
 __all__ = [
     "Vector4",
     "NormalizedVector4",
@@ -18,6 +20,10 @@ __all__ = [
     "NormalizedVector1010102PackedAsUnorm",
 ]
 
+_FLOAT2 = struct.Struct("<2f")
+_FLOAT3 = struct.Struct("<3f")
+_FLOAT4 = struct.Struct("<4f")
+
 
 class Vector4:
     def __init__(self) -> None:
@@ -26,11 +32,8 @@ class Vector4:
         self.z: float = 0.0
         self.w: float = 0.0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.x = struct.unpack("f", reader.read(4))[0]
-        self.y = struct.unpack("f", reader.read(4))[0]
-        self.z = struct.unpack("f", reader.read(4))[0]
-        self.w = struct.unpack("f", reader.read(4))[0]
+    def read(self, reader: BinaryReader) -> None:
+        self.x, self.y, self.z, self.w = reader.unpack(_FLOAT4)
 
     @property
     def vector(self) -> Vector:
@@ -38,25 +41,13 @@ class Vector4:
 
 
 class NormalizedVector4:
-    def __init__(self) -> None:
-        self.x: float = 0.0
-        self.y: float = 0.0
-        self.z: float = 0.0
-        self.w: float = 0.0
-
-    def read(self, reader: BufferedReader) -> None:
-        x = int.from_bytes(reader.read(2), "little")
-        y = int.from_bytes(reader.read(2), "little")
-        z = int.from_bytes(reader.read(2), "little")
-        w = int.from_bytes(reader.read(2), "little")
-        self.x = x / 65535.0
-        self.y = y / 65535.0
-        self.z = z / 65535.0
-        self.w = w / 65535.0
-
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z))
+    @staticmethod
+    def read_array(reader: BinaryReader, count: int) -> npt.NDArray[np.float32]:
+        """
+        Reads `count` packed vectors at once, returning a normalized (count, 4) array.
+        """
+        data = reader.read_array("<u2", count * 4)
+        return data.reshape(count, 4).astype(np.float32) / np.float32(65535.0)
 
 
 class Matrix4x4:
@@ -66,7 +57,7 @@ class Matrix4x4:
         self.m3: Vector4 = Vector4()
         self.m4: Vector4 = Vector4()
 
-    def read(self, reader: BufferedReader) -> None:
+    def read(self, reader: BinaryReader) -> None:
         self.m1.read(reader)
         self.m2.read(reader)
         self.m3.read(reader)
@@ -90,10 +81,8 @@ class Vector3:
         self.y: float = 0.0
         self.z: float = 0.0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.x = struct.unpack("f", reader.read(4))[0]
-        self.y = struct.unpack("f", reader.read(4))[0]
-        self.z = struct.unpack("f", reader.read(4))[0]
+    def read(self, reader: BinaryReader) -> None:
+        self.x, self.y, self.z = reader.unpack(_FLOAT3)
 
     @property
     def vector(self) -> Vector:
@@ -101,93 +90,55 @@ class Vector3:
 
 
 class WordVector3DNormalizedWith4Word:
-    def __init__(self) -> None:
-        self.x: float = 0.0
-        self.y: float = 0.0
-        self.z: float = 0.0
-        self.index: int = 0
-
-    def read(self, reader: BufferedReader) -> None:
-        x = int.from_bytes(reader.read(2), "little")
-        y = int.from_bytes(reader.read(2), "little")
-        z = int.from_bytes(reader.read(2), "little")
-        self.index = int.from_bytes(reader.read(2), "little")
-        self.x = x / 65535.0
-        self.y = y / 65535.0
-        self.z = z / 65535.0
-
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z))
+    @staticmethod
+    def read_array(
+        reader: BinaryReader, count: int
+    ) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.uint16]]:
+        """
+        Reads `count` vectors at once, returning a normalized (count, 3) array and their indices.
+        """
+        data = reader.read_array("<u2", count * 4).reshape(count, 4)
+        return data[:, :3].astype(np.float32) / np.float32(65535.0), data[:, 3].copy()
 
 
 class NormalizedVector2:
-    def __init__(self) -> None:
-        self.x: float = 0.0
-        self.y: float = 0.0
-
-    def read(self, reader: BufferedReader) -> None:
-        x = int.from_bytes(reader.read(2), "little")
-        y = int.from_bytes(reader.read(2), "little")
-        self.x = x / 65535.0
-        self.y = y / 65535.0
-
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y))
+    @staticmethod
+    def read_array(reader: BinaryReader, count: int) -> npt.NDArray[np.float32]:
+        """
+        Reads `count` packed vectors at once, returning a normalized (count, 2) array.
+        """
+        data = reader.read_array("<u2", count * 2)
+        return data.reshape(count, 2).astype(np.float32) / np.float32(65535.0)
 
 
 class NormalizedVector101010:
-    def __init__(self) -> None:
-        self.x: float = 0.0
-        self.y: float = 0.0
-        self.z: float = 0.0
-
-    def read(self, reader: BufferedReader) -> None:
-        val = int.from_bytes(reader.read(4), "little")
-        self.x = (val & 0x3FF) / 1023.0
-        self.y = (val >> 10 & 0x3FF) / 1023.0
-        self.z = (val >> 20 & 0x3FF) / 1023.0
-
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z))
+    @staticmethod
+    def read_array(reader: BinaryReader, count: int) -> npt.NDArray[np.float32]:
+        """
+        Reads `count` packed vectors at once, returning a normalized (count, 3) array.
+        """
+        packed = reader.read_array("<u4", count)
+        shifts = np.array([0, 10, 20], dtype=np.uint32)
+        components = (packed[:, None] >> shifts) & np.uint32(0x3FF)
+        return components.astype(np.float32) / np.float32(1023.0)
 
 
 class ByteVector4:
-    def __init__(self) -> None:
-        self.x: int = 0
-        self.y: int = 0
-        self.z: int = 0
-        self.w: int = 0
-
-    def read(self, reader: BufferedReader) -> None:
-        self.x = int.from_bytes(reader.read(1))
-        self.y = int.from_bytes(reader.read(1))
-        self.z = int.from_bytes(reader.read(1))
-        self.w = int.from_bytes(reader.read(1))
-
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z, self.w))
+    @staticmethod
+    def read_array(reader: BinaryReader, count: int) -> npt.NDArray[np.uint8]:
+        """
+        Reads `count` vectors at once as a (count, 4) array.
+        """
+        return reader.read_array(np.uint8, count * 4).reshape(count, 4)
 
 
 class ShortVector4:
-    def __init__(self) -> None:
-        self.x: int = 0
-        self.y: int = 0
-        self.z: int = 0
-        self.w: int = 0
-
-    def read(self, reader: BufferedReader) -> None:
-        self.x = int.from_bytes(reader.read(2), byteorder="little")
-        self.y = int.from_bytes(reader.read(2), byteorder="little")
-        self.z = int.from_bytes(reader.read(2), byteorder="little")
-        self.w = int.from_bytes(reader.read(2), byteorder="little")
-
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z, self.w))
+    @staticmethod
+    def read_array(reader: BinaryReader, count: int) -> npt.NDArray[np.uint16]:
+        """
+        Reads `count` vectors at once as a (count, 4) array.
+        """
+        return reader.read_array("<u2", count * 4).reshape(count, 4)
 
 
 class Bounds:
@@ -195,37 +146,23 @@ class Bounds:
         self.min: float = 0.0
         self.max: float = 0.0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.min = struct.unpack("f", reader.read(4))[0]
-        self.max = struct.unpack("f", reader.read(4))[0]
+    def read(self, reader: BinaryReader) -> None:
+        self.min, self.max = reader.unpack(_FLOAT2)
 
 
 class NormalizedVector1010102PackedAsUnorm:
-    def __init__(self) -> None:
-        self.x: float = 0.0
-        self.y: float = 0.0
-        self.z: float = 0.0
-        self.w: float = 0.0
-
-    def read(self, reader: BufferedReader) -> None:
-        packed = int.from_bytes(reader.read(4), "little")
-
-        max_10_bit = (1 << 10) - 1  # 1023
-        max_2_bit = (1 << 2) - 1  # 3
-
-        self.x = (packed & max_10_bit) / max_10_bit * 2.0 - 1.0
-        self.y = ((packed >> 10) & max_10_bit) / max_10_bit * 2.0 - 1.0
-        self.z = ((packed >> 20) & max_10_bit) / max_10_bit * 2.0 - 1.0
-        self.w = ((packed >> 30) & max_2_bit) / max_2_bit * 2.0 - 1.0
-
-        length_sq = self.x * self.x + self.y * self.y + self.z * self.z + self.w * self.w
-        if abs(length_sq) > 1e-6:
-            length: float = cast(float, (length_sq) ** 0.5)
-            self.x /= length
-            self.y /= length
-            self.z /= length
-            self.w /= length
-
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z))
+    @staticmethod
+    def read_array(reader: BinaryReader, count: int) -> npt.NDArray[np.float32]:
+        """
+        Reads `count` packed vectors at once, returning the normalized xyz components as a
+        (count, 3) array.
+        """
+        packed = reader.read_array("<u4", count)
+        shifts = np.array([0, 10, 20, 30], dtype=np.uint32)
+        masks = np.array([0x3FF, 0x3FF, 0x3FF, 0x3], dtype=np.uint32)
+        components = ((packed[:, None] >> shifts) & masks).astype(np.float32)
+        components = components / masks.astype(np.float32) * 2.0 - 1.0
+
+        length_sq = np.einsum("ij,ij->i", components, components)
+        length = np.where(np.abs(length_sq) > 1e-6, np.sqrt(length_sq), 1.0)
+        return (components[:, :3] / length[:, None]).astype(np.float32)
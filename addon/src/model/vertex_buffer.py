@@ -1,8 +1,13 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from collections.abc import Iterable, Iterator
-from io import BufferedReader
+from collections.abc import Iterator
+from itertools import pairwise
 
+import numpy as np
+import numpy.typing as npt
+
+from .binary_reader import BinaryReader
+from .blendshape_bounding_box_buffer import BlendShapeBoundingBox
 from .blendshape_index_buffer import BlendShapeIndexBuffer
 from .blendshape_position_buffer import BlendShapePositionBuffer
 from .buffer_flags import BufferFlags
@@ -33,7 +38,7 @@ class VertexBuffers:
         self.blendshape_index_buffer: BlendShapeIndexBuffer = BlendShapeIndexBuffer()
         self.blendshape_position_buffer: BlendShapePositionBuffer = BlendShapePositionBuffer()
 
-    def read(self, reader: BufferedReader, flags: BufferFlags) -> None:
+    def read(self, reader: BinaryReader, flags: BufferFlags) -> None:
         self.flags = flags
         if flags.has_position:
             self.position_buffer.read(reader)
@@ -58,53 +63,120 @@ class VertexBuffers:
         if flags.has_blendshape_position:
             self.blendshape_position_buffer.read(reader)
 
-    def enumerate_blendpairs(
+    def get_blend_arrays(
         self, mesh_flags: VertexType
-    ) -> Iterator[tuple[int, Iterable[int], Iterable[float]]]:
+    ) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.float32]]:
         """
-        Iterates over all corresponding tuples of (index, blendindices, blendweights).
-        The returned weights will be normalised and all index/weight channels will be accounted for.
+        Gets dense (vertex_count, 4) arrays of blend indices and blend weights.
+        The returned weights will be normalised, channels without influence (zero weights, missing
+        weight channels or vertices without blend data) have a weight of 0.
         """
-
+        vertex_count = len(self.position_buffer.positions)
         blend_indices = self.weight_index_buffer.indices
+        channels = blend_indices.shape[1]
 
         # Determine vertex type
         rigid = len(self.weight_buffer.weights) == 0
         rigid_boned = mesh_flags == VertexType.RigidBoned and not self.flags.has_blend_weights
         implied = mesh_flags != VertexType.Skinned8Weights and self.flags.has_blend_weights
 
-        # Only get blend weights if we're not using rigid or rigid_boned
-        blend_weights = [] if (rigid or rigid_boned) else self.weight_buffer.weights
-
-        for i in range(len(self.position_buffer.positions)):
-            if i >= len(blend_indices):
+        indices = np.zeros((vertex_count, channels), dtype=np.int32)
+        weights = np.zeros((vertex_count, channels), dtype=np.float32)
+        count = min(vertex_count, len(blend_indices))
+        indices[:count] = blend_indices[:count]
+
+        if rigid or rigid_boned:
+            # For rigid boned, each index keeps its actual bone index value with an equal weight
+            weights[:count] = 1.0
+        else:
+            blend_weights = self.weight_buffer.weights
+            count = min(count, len(blend_weights))
+            columns = min(channels, blend_weights.shape[1])
+            weights[:count, :columns] = blend_weights[:count, :columns]
+            # The last channel gets an implied weight of 1.0
+            if implied and columns < channels:
+                weights[:count, columns] = 1.0
+
+        # Normalize the weights so they all add up to 1
+        weight_sum = weights.sum(axis=1, keepdims=True)
+        np.divide(weights, weight_sum, out=weights, where=weight_sum > 0)
+        return indices, weights
+
+    def get_weight_groups(
+        self, mesh_flags: VertexType, group_count: int
+    ) -> Iterator[tuple[int, float, npt.NDArray[np.int32]]]:
+        """
+        Iterates over the vertices influenced by each bone, grouped by weight, as tuples of
+        (bone index, weight, vertex indices). Channels of a vertex pointing at the same bone are
+        summed, influences without weight or with a bone index outside of `group_count` are skipped.
+        """
+        indices, weights = self.get_blend_arrays(mesh_flags)
+        vertices = np.broadcast_to(
+            np.arange(len(indices), dtype=np.int32)[:, None], indices.shape
+        ).ravel()
+        bones = indices.ravel()
+        values = weights.ravel()
+        mask = (values > 0) & (bones < group_count)
+        vertices, bones, values = vertices[mask], bones[mask], values[mask]
+        if len(values) == 0:
+            return
+
+        # Sum duplicate (bone, vertex) pairs
+        order = np.lexsort((vertices, bones))
+        vertices, bones, values = vertices[order], bones[order], values[order]
+        new_pair = np.empty(len(values), dtype=bool)
+        new_pair[0] = True
+        new_pair[1:] = (bones[1:] != bones[:-1]) | (vertices[1:] != vertices[:-1])
+        starts = np.flatnonzero(new_pair)
+        vertices, bones = vertices[starts], bones[starts]
+        values = np.add.reduceat(values, starts)
+
+        # Runs of the same bone and weight can be assigned at once
+        order = np.lexsort((vertices, values, bones))
+        vertices, bones, values = vertices[order], bones[order], values[order]
+        new_run = np.empty(len(values), dtype=bool)
+        new_run[0] = True
+        new_run[1:] = (bones[1:] != bones[:-1]) | (values[1:] != values[:-1])
+        bounds = np.append(np.flatnonzero(new_run), len(values))
+        for start, end in pairwise(bounds):
+            yield int(bones[start]), float(values[start]), vertices[start:end]
+
+    def get_shape_deltas(
+        self, bounding_boxes: list[BlendShapeBoundingBox]
+    ) -> Iterator[tuple[int, npt.NDArray[np.intp], npt.NDArray[np.float32]]]:
+        """
+        Iterates over the blendshape targets as tuples of (target, vertex indices, position deltas).
+        The deltas are dequantized against the bounding box of their target, targets without a
+        bounding box or where every delta is zero are skipped.
+        """
+        shapes = self.blendshape_position_buffer
+        starts = self.blendshape_index_buffer.indices
+        if shapes.count == 0 or len(starts) == 0:
+            return
+
+        # Every vertex points at the first of its deltas, which run up to the next vertex's start
+        with_deltas = np.flatnonzero(starts >= 0)
+        vertex_order = with_deltas[np.argsort(starts[with_deltas], kind="stable")]
+        sorted_starts = starts[vertex_order]
+        owner = np.searchsorted(sorted_starts, shapes.order, side="right") - 1
+        owned = owner >= 0
+        vertices = vertex_order[np.maximum(owner, 0)]
+
+        for i, target in enumerate(shapes.targets.tolist()):
+            if target >= len(bounding_boxes):
                 continue
-
-            indices = [int(x) for x in blend_indices[i].vector]
-
-            if rigid or rigid_boned:
-                # For rigid boned, each index keeps its actual bone index value
-                # We assign weight 1.0 to each bone index
-                weights = [1.0] * len(indices)
-            else:
-                # For skinned vertices, get the weights from the buffer
-                if i >= len(blend_weights):
-                    continue
-                weights = blend_weights[i].vector.to_tuple()
-
-                # Append a 1.0 to the end of weights list for implied weights
-                if implied:
-                    weights = [*weights, 1.0]
-
-                # Filter out zero weights and corresponding indices
-                if 0 in weights:
-                    valid_pairs = [(idx, w) for idx, w in zip(indices, weights) if w > 0]
-                    indices = [pair[0] for pair in valid_pairs]
-                    weights = [pair[1] for pair in valid_pairs]
-
-            # Normalize the weights so they all add up to 1
-            weight_sum = sum(weights)
-            if weight_sum > 0:
-                weights = [w / weight_sum for w in weights]
-
-            yield (i, indices, weights)
+            start, end = shapes.target_offsets[i], shapes.target_offsets[i + 1]
+            mask = owned[start:end]
+            bounds = bounding_boxes[target]
+            scale = np.array(
+                (bounds.position_scale.x, bounds.position_scale.y, bounds.position_scale.z),
+                dtype=np.float32,
+            )
+            offset = np.array(
+                (bounds.position_offset.x, bounds.position_offset.y, bounds.position_offset.z),
+                dtype=np.float32,
+            )
+            deltas = shapes.deltas[start:end][mask] * scale + offset
+            if not np.any(np.abs(deltas) > 1e-6):
+                continue
+            yield target, vertices[start:end][mask], deltas
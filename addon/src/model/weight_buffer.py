@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
 from ..exceptions import IncorrectStrideValue
+from .binary_reader import BinaryReader
 from .vectors import NormalizedVector101010
 
 __all__ = ["WeightBuffer"]
@@ -12,14 +14,11 @@ class WeightBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.weights: list[NormalizedVector101010] = []
+        self.weights: npt.NDArray[np.float32] = np.empty((0, 3), dtype=np.float32)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: BinaryReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 4:
             raise IncorrectStrideValue("Invalid Weight buffer stride")
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            weight = NormalizedVector101010()
-            weight.read(reader)
-            self.weights.append(weight)
+        self.count = reader.read_u32()
+        self.weights = NormalizedVector101010.read_array(reader, self.count)
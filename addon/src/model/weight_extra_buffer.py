@@ -1,10 +1,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-import struct
-from io import BufferedReader
-from typing import cast
+import numpy as np
+import numpy.typing as npt
 
 from ..exceptions import IncorrectStrideValue
+from .binary_reader import BinaryReader
 
 __all__ = ["WeightExtraBuffer"]
 
@@ -13,13 +13,11 @@ class WeightExtraBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.values: list[float] = []
+        self.values: npt.NDArray[np.float32] = np.empty(0, dtype=np.float32)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: BinaryReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 4:
             raise IncorrectStrideValue("Invalid WeightExtra buffer stride")
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            value: float = cast(float, struct.unpack("f", reader.read(4))[0])
-            self.values.append(value)
+        self.count = reader.read_u32()
+        self.values = reader.read_array("<f4", self.count)
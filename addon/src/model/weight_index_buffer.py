@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
 from ..exceptions import IncorrectStrideValue
+from .binary_reader import BinaryReader
 from .vectors import ByteVector4, ShortVector4
 
 __all__ = ["WeightIndexBuffer"]
@@ -12,20 +14,15 @@ class WeightIndexBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.indices: list[ByteVector4 | ShortVector4] = []
+        self.indices: npt.NDArray[np.uint8 | np.uint16] = np.empty((0, 4), dtype=np.uint8)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
-        if self.stride % 2 != 0:
-            raise IncorrectStrideValue("WeightIndex buffer stride was not a multiple of 2!")
+    def read(self, reader: BinaryReader) -> None:
+        self.stride = reader.read_i8()
+        if self.stride not in (4, 8):
+            raise IncorrectStrideValue("WeightIndex buffer stride was not 4 or 8!")
 
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            if self.stride == 4:
-                vector = ByteVector4()
-                vector.read(reader)
-                self.indices.append(vector)
-            if self.stride == 8:
-                vector = ShortVector4()
-                vector.read(reader)
-                self.indices.append(vector)
+        self.count = reader.read_u32()
+        if self.stride == 4:
+            self.indices = ByteVector4.read_array(reader, self.count)
+        else:
+            self.indices = ShortVector4.read_array(reader, self.count)
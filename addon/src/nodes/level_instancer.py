@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2026 The Halo Archive
+from typing import cast
+
+import bpy
+from bpy.types import (
+    GeometryNodeCollectionInfo,
+    GeometryNodeInputNamedAttribute,
+    GeometryNodeInstanceOnPoints,
+    NodeGroupInput,
+    NodeGroupOutput,
+    NodeSocketCollection,
+    NodeSocketGeometry,
+    NodeSocketString,
+    NodeTree,
+)
+
+from ..utils import create_link, create_node, create_socket
+
+__all__ = ["LevelInstancer"]
+
+
+class LevelInstancer:
+    """
+    Instances a collection on every point of the input geometry, using the point's `rotation`
+    and `scale` attributes.
+    """
+
+    def __init__(self) -> None:
+        self.node_tree: NodeTree | None = bpy.data.node_groups.get("Level Instancer")
+        if self.node_tree:
+            return
+        else:
+            self.node_tree = bpy.data.node_groups.new(
+                type="GeometryNodeTree", name="Level Instancer"
+            )
+        self.create_sockets()
+        self.create_nodes()
+
+    def create_sockets(self) -> None:
+        if not self.node_tree:
+            return
+        interface = self.node_tree.interface
+        _ = create_socket(interface, "Geometry", NodeSocketGeometry, False)
+        _ = create_socket(interface, "Geometry", NodeSocketGeometry)
+        _ = create_socket(interface, "Collection", NodeSocketCollection)
+
+    def create_nodes(self) -> None:
+        if not self.node_tree:
+            return
+        nodes = self.node_tree.nodes
+        output = create_node(nodes, 400, 0, NodeGroupOutput)
+        input = create_node(nodes, -400, 0, NodeGroupInput)
+
+        collection_info = create_node(nodes, -150, -40, GeometryNodeCollectionInfo)
+        collection_info.transform_space = "ORIGINAL"
+
+        rotation = create_node(nodes, -150, -200, GeometryNodeInputNamedAttribute)
+        rotation.data_type = "QUATERNION"
+        cast(NodeSocketString, rotation.inputs[0]).default_value = "rotation"
+
+        scale = create_node(nodes, -150, -320, GeometryNodeInputNamedAttribute)
+        scale.data_type = "FLOAT_VECTOR"
+        cast(NodeSocketString, scale.inputs[0]).default_value = "scale"
+
+        instance_on_points = create_node(nodes, 150, 0, GeometryNodeInstanceOnPoints)
+
+        links = self.node_tree.links
+        create_link(links, input, instance_on_points, 0, 0)
+        create_link(links, input, collection_info, 1, 0)
+        create_link(links, collection_info, instance_on_points, 0, 2)
+        create_link(links, rotation, instance_on_points, 0, 5)
+        create_link(links, scale, instance_on_points, 0, 6)
+        create_link(links, instance_on_points, output, 0, 0)
+
+    @property
+    def collection_identifier(self) -> str:
+        """
+        The identifier of the collection input, used to set it on a modifier.
+        """
+        if not self.node_tree:
+            return ""
+        for item in self.node_tree.interface.items_tree:
+            if (
+                item.item_type == "SOCKET"
+                and item.in_out == "INPUT"  # ty: ignore[unresolved-attribute]
+                and item.name == "Collection"  # ty: ignore[unresolved-attribute]
+            ):
+                return item.identifier  # ty: ignore[unresolved-attribute]
+        return ""
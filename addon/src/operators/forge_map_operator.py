@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import final
 
 import bpy
+import numpy as np
 from bpy.types import (
     Collection,
     Context,
@@ -15,40 +16,19 @@ from bpy.types import (
     Object,
     Operator,
 )
-from mathutils import Matrix, Quaternion, Vector
+from mathutils import Matrix, Vector
 
 from ..constants import BLOCKER_MATERIAL, INCORRECT_RTGOS
 from ..forge_level_reader import ForgeFolder, ForgeLevel, get_forge_map
 from ..json_definitions import ForgeMaterial, ForgeObjectDefinition, ForgeObjectRepresentation
 from ..model.importer.model_importer import ModelImporter
+from ..transforms import compose_matrices, orthonormal_frames
 from ..ui.forge_map_options import get_forge_map_options
 from ..ui.material_options import get_material_options
 from ..utils import get_data_folder, read_json_file
 from .material_operator import import_materials
 
 
-def apply_rtgo_transform(
-    pos: list[float],
-    offset: Vector,
-    scale: list[float],
-    rotation: Quaternion,
-) -> list[float]:
-    scaled_offset = Vector(
-        (
-            offset[0] * scale[0],
-            offset[1] * scale[1],
-            offset[2] * scale[2],
-        )
-    )
-    scaled_offset.rotate(rotation)
-    new_axis: list[float] = [
-        pos[0] + scaled_offset[0],
-        pos[1] + scaled_offset[1],
-        pos[2] + scaled_offset[2],
-    ]
-    return new_axis
-
-
 @final
 class ForgeMapOperator(Operator):
     bl_idname = "ekur.importforgemap"
@@ -171,7 +151,18 @@ class ForgeMapOperator(Operator):
         if definition is None or context is None or context.scene is None or globals is None:
             return {"CANCELLED"}
         cats, root_folder = self.create_category(context.scene.collection, level)
-        for object in level.objects:
+        positions = np.array([object.position for object in level.objects], dtype=np.float64)
+        scales = np.array([object.scale for object in level.objects], dtype=np.float64)
+        rotations, valid = orthonormal_frames(
+            [object.rotation_forward for object in level.objects],
+            [object.rotation_up for object in level.objects],
+        )
+        # Instances are placed once every object has been created, in a single batch
+        placements: list[tuple[Object, int, Vector]] = []
+        for index, object in enumerate(level.objects):
+            if not valid[index]:
+                logging.warning(f"Skipping forge object {object.index} with an invalid rotation")
+                continue
             name: str = ""
             main_collection: Collection | None = None
             if options.import_folders:
@@ -232,27 +223,8 @@ class ForgeMapOperator(Operator):
                 if name != "":
                     instance_obj.name = name
 
-                forward = Vector(object.rotation_forward).normalized()
-                up = Vector(object.rotation_up).normalized()
-                right = forward.cross(up)
-                if type(up) is not Vector or type(right) is not Vector:
-                    continue
-                right = right.normalized()
-                rot_matrix = Matrix(
-                    (
-                        (forward[0], -right[0], up[0], 0.0),
-                        (forward[1], -right[1], up[1], 0.0),
-                        (forward[2], -right[2], up[2], 0.0),
-                        (0.0, 0.0, 0.0, 1.0),
-                    )
-                )
-                quat = rot_matrix.to_quaternion()
-                instance_obj.location = Vector(
-                    apply_rtgo_transform(object.position, obj.location, object.scale, quat)
-                )
                 instance_obj.rotation_mode = "QUATERNION"
-                instance_obj.rotation_quaternion = quat
-                instance_obj.scale = object.scale
+                placements.append((instance_obj, index, obj.location))
                 if main_collection:
                     main_collection.objects.link(instance_obj)
                 elif root_folder:
@@ -263,6 +235,17 @@ class ForgeMapOperator(Operator):
                 if type(instance_obj.data) is Mesh and "UV1" in instance_obj.data.uv_layers:
                     instance_obj.data.uv_layers["UV1"].active_render = True
                     instance_obj.data.uv_layers["UV1"].active = True
+        if placements:
+            indices = [index for _, index, _ in placements]
+            matrices = compose_matrices(
+                positions[indices],
+                rotations[indices],
+                scales[indices],
+                [tuple(offset) for _, _, offset in placements],
+            )
+            for (instance_obj, _, _), matrix in zip(placements, matrices):
+                instance_obj.matrix_world = Matrix(matrix.tolist())
+
         master_collection = bpy.data.collections.get("Master Geometries")
         if master_collection:
             master_collection.hide_viewport = True
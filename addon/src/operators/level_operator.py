@@ -1,18 +1,237 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
+import logging
+import struct
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import final
+from typing import cast, final
 
 import bpy
-from bpy.types import Context, Object, Operator
-from mathutils import Matrix
+import numpy as np
+import numpy.typing as npt
+from bpy.types import (
+    Camera,
+    Collection,
+    Context,
+    Mesh,
+    NodesModifier,
+    Object,
+    Operator,
+    Scene,
+)
+from mathutils import Matrix, Quaternion, Vector
 
-from ..json_definitions import Level
+from ..exceptions import IncorrectStrideValue
+from ..json_definitions import Instance
+from ..level_reader import convert_level, iter_level_batches
 from ..model.importer.model_importer import ModelImporter
+from ..model.metadata import Model
+from ..model.prefetch import prefetch_models
+from ..model.scan import scan_model_bounds
+from ..nodes.level_instancer import LevelInstancer
+from ..spatial_index import SpatialGrid
+from ..transforms import compose_matrices, orthonormal_frames, rotations_to_quaternions
 from ..ui.level_options import get_level_options
-from ..utils import get_data_folder, read_json_file
+from ..utils import (
+    get_addon_preferences,
+    get_data_folder,
+    get_model_cache_folder,
+)
 
-__all__ = ["ImportLevelOperator"]
+__all__ = ["ConvertLevelOperator", "ImportLevelOperator", "RealizeLevelInstancesOperator"]
+
+_BATCH_SIZE = 4096
+
+# The materials of the first instance of each geometry, and batches of the positions, rotations
+# and scales of its instances
+_InstancePoints = dict[
+    str,
+    tuple[
+        list[int],
+        list[tuple[npt.NDArray[np.float32], npt.NDArray[np.float32], npt.NDArray[np.float32]]],
+    ],
+]
+
+# Spatial indices of the levels imported with a filter, by level path and data folder, so
+# importing another area of the same level doesn't scan its models again
+_level_indices: dict[tuple[str, str], tuple[int, SpatialGrid]] = {}
+
+
+def _get_instance_frames(
+    instances: list[Instance],
+) -> tuple[
+    npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.bool_]
+]:
+    """
+    Gathers the transforms of level instances into arrays.
+
+    Args:
+    - instances: The instances to gather.
+
+    Returns:
+    - The (n, 3) positions, (n, 3, 3) rotations and (n, 3) scales of the instances.
+    - A (n,) mask of the instances with a valid rotation.
+    """
+    positions = np.array([instance["position"] for instance in instances], dtype=np.float64)
+    scales = np.array([instance["scale"] for instance in instances], dtype=np.float64)
+    rotations, valid = orthonormal_frames(
+        [instance["forward"] for instance in instances], [instance["up"] for instance in instances]
+    )
+    if not valid.all():
+        logging.warning(
+            f"Skipping {np.count_nonzero(~valid)} level instances with invalid rotations"
+        )
+    return positions.reshape(-1, 3), rotations, scales.reshape(-1, 3), valid
+
+
+def _scan_bounds(
+    path: Path,
+) -> tuple[tuple[float, float, float], tuple[float, float, float]] | None:
+    if not path.is_file():
+        return None
+    try:
+        return scan_model_bounds(path)
+    except (OSError, ValueError, EOFError, struct.error, IncorrectStrideValue) as e:
+        logging.warning(f"Failed to read the bounds of model {path}: {e}")
+        return None
+
+
+def _build_level_index(level_path: Path, data_folder: str) -> SpatialGrid:
+    """
+    Builds a spatial index over the world bounds of the instances of a level, made by transforming
+    the bounding box of each instance's model. Instances whose model can't be read are indexed by
+    their position. Only the transforms of the instances are kept while the level is streamed.
+    """
+    global_ids: list[npt.NDArray[np.int64]] = []
+    positions: list[npt.NDArray[np.float64]] = []
+    rotations: list[npt.NDArray[np.float64]] = []
+    scales: list[npt.NDArray[np.float64]] = []
+    for batch in iter_level_batches(level_path, _BATCH_SIZE):
+        global_ids.append(np.array([instance["global_id"] for instance in batch], dtype=np.int64))
+        positions.append(np.array([instance["position"] for instance in batch], dtype=np.float64))
+        scales.append(np.array([instance["scale"] for instance in batch], dtype=np.float64))
+        rotations.append(
+            orthonormal_frames(
+                [instance["forward"] for instance in batch], [instance["up"] for instance in batch]
+            )[0]
+        )
+    if not global_ids:
+        return SpatialGrid(np.zeros((0, 3)), np.zeros((0, 3)))
+    ids = np.concatenate(global_ids)
+
+    unique_ids, inverse = np.unique(ids, return_inverse=True)
+    paths = [Path(f"{data_folder}/runtime_geo/{global_id}.ekur") for global_id in unique_ids]
+    with ThreadPoolExecutor() as executor:
+        model_bounds = list(executor.map(_scan_bounds, paths))
+    unique_min = np.zeros((len(unique_ids), 3), dtype=np.float64)
+    unique_max = np.zeros((len(unique_ids), 3), dtype=np.float64)
+    for i, bounds in enumerate(model_bounds):
+        if bounds is not None:
+            unique_min[i] = np.minimum(bounds[0], bounds[1])
+            unique_max[i] = np.maximum(bounds[0], bounds[1])
+    local_min = unique_min[inverse]
+    local_max = unique_max[inverse]
+
+    transforms = np.concatenate(rotations) * np.concatenate(scales)[:, None, :]
+    centers = np.concatenate(positions) + np.einsum(
+        "nij,nj->ni", transforms, (local_min + local_max) * 0.5
+    )
+    extents = np.einsum("nij,nj->ni", np.abs(transforms), (local_max - local_min) * 0.5)
+    return SpatialGrid(centers - extents, centers + extents)
+
+
+def _get_level_index(level_path: Path, data_folder: str) -> SpatialGrid:
+    key = (str(level_path.resolve()), data_folder)
+    mtime_ns = level_path.stat().st_mtime_ns
+    cached = _level_indices.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    index = _build_level_index(level_path, data_folder)
+    _level_indices[key] = (mtime_ns, index)
+    return index
+
+
+def _iter_instance_batches(
+    level_path: Path, selection: npt.NDArray[np.int64] | None
+) -> Iterator[list[Instance]]:
+    """
+    Streams the instances of a level in batches, keeping only the selected ones.
+
+    Args:
+    - level_path: The path to the level file.
+    - selection: Optional sorted indices of the instances to keep.
+    """
+    offset = 0
+    for batch in iter_level_batches(level_path, _BATCH_SIZE):
+        if selection is not None:
+            first, last = np.searchsorted(selection, (offset, offset + len(batch)))
+            selected = (selection[first:last] - offset).tolist()
+            offset += len(batch)
+            batch = [batch[i] for i in selected]
+        if batch:
+            yield batch
+
+
+def _get_camera_frustum(scene: Scene) -> npt.NDArray[np.float64] | None:
+    """
+    Gets the world space corners of the view frustum of the scene's active camera, near corners
+    first.
+    """
+    camera = scene.camera
+    if camera is None or type(camera.data) is not Camera:
+        return None
+    data = camera.data
+    frame = data.view_frame(scene=scene)
+    corners: list[tuple[float, ...]] = []
+    for clip in (data.clip_start, data.clip_end):
+        for corner in frame:
+            if data.type == "ORTHO":
+                local = Vector((corner.x, corner.y, -clip))
+            else:
+                local = corner * (clip / -corner.z)
+            corners.append(tuple(camera.matrix_world @ local))
+    return np.array(corners, dtype=np.float64)
+
+
+def _write_points(
+    mesh: Mesh,
+    positions: npt.NDArray[np.float32],
+    rotations: npt.NDArray[np.float32],
+    scales: npt.NDArray[np.float32],
+) -> None:
+    """
+    Replaces the geometry of a mesh with loose points carrying instance transforms.
+
+    Args:
+    - mesh: The mesh to write the points to.
+    - positions: The (n, 3) point positions.
+    - rotations: The (n, 4) rotations as wxyz quaternions.
+    - scales: The (n, 3) scales.
+    """
+    mesh.clear_geometry()
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(positions, dtype=np.float32).ravel())
+    rotation = mesh.attributes.get("rotation") or mesh.attributes.new(
+        "rotation", "QUATERNION", "POINT"
+    )
+    rotation.data.foreach_set("value", np.ascontiguousarray(rotations, dtype=np.float32).ravel())
+    scale = mesh.attributes.get("scale") or mesh.attributes.new("scale", "FLOAT_VECTOR", "POINT")
+    scale.data.foreach_set("vector", np.ascontiguousarray(scales, dtype=np.float32).ravel())
+    mesh.update()
+
+
+def _read_points(
+    mesh: Mesh,
+) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.float32], npt.NDArray[np.float32]]:
+    count = len(mesh.vertices)
+    positions = np.empty(count * 3, dtype=np.float32)
+    rotations = np.empty(count * 4, dtype=np.float32)
+    scales = np.empty(count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    mesh.attributes["rotation"].data.foreach_get("value", rotations)
+    mesh.attributes["scale"].data.foreach_get("vector", scales)
+    return positions.reshape(count, 3), rotations.reshape(count, 4), scales.reshape(count, 3)
 
 
 @final
@@ -31,30 +250,174 @@ class ImportLevelOperator(Operator):
         global_id: str,
         data_folder: str,
         materials: list[int],
+        decoded_model: Model | None = None,
     ) -> list[Object]:
         if global_id in self._geometry_cache or bpy.context.scene is None:
             return self._geometry_cache[global_id]
 
         path = f"{data_folder}/runtime_geo/{global_id}.ekur"
         geo_importer = ModelImporter()
-        imported_objects = geo_importer.start_import(path, materials=materials, bones=False)
+        imported_objects = geo_importer.start_import(
+            path, materials=materials, bones=False, decoded_model=decoded_model
+        )
+
+        master_collection = self._get_master_collection()
+        source_objects = imported_objects
+        for source_object in source_objects:
+            if source_object.name in bpy.context.scene.collection.objects:
+                bpy.context.scene.collection.objects.unlink(source_object)
+            master_collection.objects.link(source_object)
+
+        self._geometry_cache[global_id] = source_objects
+        return source_objects
+
+    def _prefetch_geometry(self, instances: list[Instance], data_folder: str) -> None:
+        """
+        Decodes the geometry of the given instances in a thread pool up front, then creates the
+        objects of each geometry as soon as it has been decoded.
+        """
+        materials: dict[str, list[int]] = {}
+        for instance in instances:
+            global_id = str(instance["global_id"])
+            if global_id not in self._geometry_cache:
+                _ = materials.setdefault(global_id, instance["material"])
+        paths: list[tuple[str, Path]] = []
+        for global_id in materials:
+            path = Path(f"{data_folder}/runtime_geo/{global_id}.ekur")
+            if path.is_file():
+                paths.append((global_id, path))
+            else:
+                logging.warning(f"Model path does not exist: {path}")
+                self._geometry_cache[global_id] = []
+
+        preferences = get_addon_preferences()
+        cache_folder = get_model_cache_folder() if preferences.use_model_cache else None
+        max_cache_size = preferences.model_cache_size * 1024 * 1024
+        models = prefetch_models(paths, cache_folder=cache_folder, max_cache_size=max_cache_size)
+        for global_id, model in models:
+            # Models that failed to decode are imported again the regular way
+            _ = self._get_or_create_geometry(global_id, data_folder, materials[global_id], model)
 
+    def _get_selection(
+        self, context: Context, level_path: Path, data_folder: str
+    ) -> npt.NDArray[np.int64] | None:
+        """
+        Finds the instances inside the area picked in the level options.
+
+        Returns:
+        - The sorted indices of the instances to import, or None if the area could not be
+          determined.
+        """
+        options = get_level_options()
+        index = _get_level_index(level_path, data_folder)
+        if options.spatial_filter == "BOX":
+            indices = index.query_box(tuple(options.box_min), tuple(options.box_max))
+        elif options.spatial_filter == "CURSOR":
+            if context.scene is None:
+                return None
+            indices = index.query_sphere(tuple(context.scene.cursor.location), options.radius)
+        else:
+            corners = _get_camera_frustum(context.scene) if context.scene else None
+            if corners is None:
+                self.report({"ERROR"}, "The scene has no active camera")
+                return None
+            indices = index.query_frustum(corners)
+        logging.info(f"Importing {len(indices)} of {len(index)} level instances")
+        return indices
+
+    def _get_master_collection(self) -> Collection:
         master_collection = bpy.data.collections.get("Master Geometries")
         if not master_collection:
             master_collection = bpy.data.collections.new("Master Geometries")
-            bpy.context.scene.collection.children.link(master_collection)
+            if bpy.context.scene:
+                bpy.context.scene.collection.children.link(master_collection)
 
         master_collection.hide_viewport = True
         master_collection.hide_render = True
+        return master_collection
 
-        source_objects = imported_objects
+    def _create_instance_collection(
+        self, global_id: str, source_objects: list[Object]
+    ) -> Collection:
+        """
+        Creates the collection instanced by the level instancer for a geometry. It holds copies of
+        the geometry's objects without their import transform, the same way they would be placed
+        as separate objects.
+        """
+        collection = bpy.data.collections.new(f"{global_id}_instance")
+        self._get_master_collection().children.link(collection)
         for source_object in source_objects:
-            if source_object.name in bpy.context.scene.collection.objects:
-                bpy.context.scene.collection.objects.unlink(source_object)
-            master_collection.objects.link(source_object)
+            proxy = bpy.data.objects.new(
+                name=f"{source_object.name}_instance", object_data=source_object.data
+            )
+            collection.objects.link(proxy)
+        return collection
 
-        self._geometry_cache[global_id] = source_objects
-        return source_objects
+    def _create_instances(
+        self, instances: list[Instance], data_folder: str, collection: Collection
+    ) -> None:
+        positions, rotations, scales, valid = _get_instance_frames(instances)
+        matrices = compose_matrices(positions, rotations, scales)
+        for instance, matrix, is_valid in zip(instances, matrices, valid):
+            if not is_valid:
+                continue
+            source_objects = self._get_or_create_geometry(
+                str(instance["global_id"]), data_folder, instance["material"]
+            )
+            world_matrix = Matrix(matrix.tolist())
+            for source_object in source_objects:
+                instance_obj = bpy.data.objects.new(
+                    name=f"{source_object.name}_instance", object_data=source_object.data
+                )
+                instance_obj.matrix_world = world_matrix
+
+                collection.objects.link(instance_obj)
+
+    def _collect_instanced(self, instances: list[Instance], points: _InstancePoints) -> None:
+        """
+        Adds the transforms of a batch of instances to the points of their geometry.
+        """
+        positions, rotations, scales, valid = _get_instance_frames(instances)
+        quaternions = rotations_to_quaternions(rotations)
+        global_ids = np.array([str(instance["global_id"]) for instance in instances])
+        first_instance = {str(instance["global_id"]): instance for instance in reversed(instances)}
+        for global_id in np.unique(global_ids[valid]).tolist():
+            mask = valid & (global_ids == global_id)
+            entry = points.setdefault(global_id, (first_instance[global_id]["material"], []))
+            entry[1].append(
+                (
+                    positions[mask].astype(np.float32),
+                    quaternions[mask].astype(np.float32),
+                    scales[mask].astype(np.float32),
+                )
+            )
+
+    def _create_instancers(
+        self, points: _InstancePoints, data_folder: str, collection: Collection
+    ) -> None:
+        instancer = LevelInstancer()
+        identifier = instancer.collection_identifier
+
+        for global_id, (materials, batches) in points.items():
+            source_objects = self._get_or_create_geometry(global_id, data_folder, materials)
+            if not source_objects:
+                continue
+
+            mesh = bpy.data.meshes.new(f"{global_id}_instances")
+            _write_points(
+                mesh,
+                np.concatenate([batch[0] for batch in batches]),
+                np.concatenate([batch[1] for batch in batches]),
+                np.concatenate([batch[2] for batch in batches]),
+            )
+            points_obj = bpy.data.objects.new(f"{global_id}_instances", mesh)
+            points_obj["instance_collection"] = self._create_instance_collection(
+                global_id, source_objects
+            )
+            modifier = cast(NodesModifier, points_obj.modifiers.new("Level Instancer", "NODES"))
+            modifier.node_group = instancer.node_tree
+            modifier[identifier] = points_obj["instance_collection"]
+            collection.objects.link(points_obj)
 
     def execute(self, context: Context | None) -> set[str]:  # ty:ignore[invalid-method-override]
         self._geometry_cache: dict[str, list[Object]] = {}
@@ -63,32 +426,108 @@ class ImportLevelOperator(Operator):
         options = get_level_options()
 
         level_path = Path(options.level_path)
-        level = read_json_file(level_path, Level)
-        if level is None:
+        if not level_path.is_file():
+            logging.warning(f"File path does not exist!: {level_path}")
             return {"CANCELLED"}
         data = get_data_folder()
+        selection = None
+        if options.spatial_filter != "NONE":
+            selection = self._get_selection(context, level_path, data)
+            if selection is None:
+                return {"CANCELLED"}
 
-        for instance in level["instances"]:
-            source_objects = self._get_or_create_geometry(
-                str(instance["global_id"]), data, instance["material"]
+        # Instances are created one batch at a time as the level is read, so only a batch of
+        # them is held in memory
+        points: _InstancePoints = {}
+        try:
+            for instances in _iter_instance_batches(level_path, selection):
+                self._prefetch_geometry(instances, data)
+                if options.use_instancing:
+                    self._collect_instanced(instances, points)
+                else:
+                    self._create_instances(instances, data, context.collection)
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to read level {level_path}: {e}")
+            self._geometry_cache = {}
+            return {"CANCELLED"}
+        if options.use_instancing:
+            self._create_instancers(points, data, context.collection)
+
+        self._geometry_cache = {}
+        return {"FINISHED"}
+
+
+@final
+class ConvertLevelOperator(Operator):
+    bl_idname = "ekur.convertlevel"
+    bl_label = "Convert to Binary"
+    bl_description = "Write the level to a compact binary .eklv file next to it, which imports faster than the json file"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context: Context | None) -> set[str]:  # ty:ignore[invalid-method-override]
+        options = get_level_options()
+        level_path = Path(options.level_path)
+        if not level_path.is_file():
+            logging.warning(f"File path does not exist!: {level_path}")
+            return {"CANCELLED"}
+        output = level_path.with_suffix(".eklv")
+        try:
+            count = convert_level(level_path, output)
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to convert level {level_path}: {e}")
+            return {"CANCELLED"}
+        logging.info(f"Wrote {count} level instances to {output}")
+        return {"FINISHED"}
+
+
+@final
+class RealizeLevelInstancesOperator(Operator):
+    bl_idname = "ekur.realizelevelinstances"
+    bl_label = "Realize Selected Instances"
+    bl_description = "Turn the selected points of level instancers into separate objects. If no points are selected, every instance of the selected instancers is realized"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context: Context | None) -> bool:
+        return context is not None and context.mode == "OBJECT"
+
+    def execute(self, context: Context | None) -> set[str]:  # ty:ignore[invalid-method-override]
+        if context is None:
+            return {"CANCELLED"}
+        for points in list(context.selected_objects):
+            instance_collection = points.get("instance_collection")
+            if type(points.data) is not Mesh or not isinstance(instance_collection, Collection):
+                continue
+            self._realize(points, points.data, instance_collection)
+        return {"FINISHED"}
+
+    def _realize(self, points: Object, mesh: Mesh, instance_collection: Collection) -> None:
+        positions, rotations, scales = _read_points(mesh)
+        selected = np.zeros(len(positions), dtype=bool)
+        mesh.vertices.foreach_get("select", selected)
+        if not selected.any():
+            selected[:] = True
+
+        target = points.users_collection[0] if points.users_collection else None
+        if target is None and bpy.context.scene:
+            target = bpy.context.scene.collection
+        if target is None:
+            return
+        for position, rotation, scale in zip(
+            positions[selected], rotations[selected], scales[selected]
+        ):
+            matrix = points.matrix_world @ Matrix.LocRotScale(
+                position.tolist(), Quaternion(rotation.tolist()), scale.tolist()
             )
-            for source_object in source_objects:
+            for source_object in instance_collection.objects:
                 instance_obj = bpy.data.objects.new(
-                    name=f"{source_object.name}_instance", object_data=source_object.data
+                    name=source_object.name, object_data=source_object.data
                 )
-                rotmat = Matrix(
-                    (
-                        (instance["forward"][0], instance["left"][0], instance["up"][0], 0.0),
-                        (instance["forward"][1], instance["left"][1], instance["up"][1], 0.0),
-                        (instance["forward"][2], instance["left"][2], instance["up"][2], 0.0),
-                        (0.0, 0.0, 0.0, 1.0),
-                    )
-                )
-                instance_obj.matrix_world = Matrix.LocRotScale(
-                    instance["position"], rotmat.to_quaternion(), instance["scale"]
-                )
-
-                context.collection.objects.link(instance_obj)
+                instance_obj.matrix_world = matrix
+                target.objects.link(instance_obj)
 
-        self._geometry_cache = {}
-        return {"FINISHED"}
+        remaining = ~selected
+        if remaining.any():
+            _write_points(mesh, positions[remaining], rotations[remaining], scales[remaining])
+        else:
+            bpy.data.objects.remove(points)
@@ -1,14 +1,21 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2026 The Halo Archive
+import logging
+from pathlib import Path
 from typing import cast, final
 
 import bpy
 from bpy.types import Collection, Context, Operator
 
 from ..model.importer.model_importer import ModelImporter
+from ..model.scan import build_catalogue, find_models_with_material, find_models_with_permutation
 from ..ui.model_options import get_model_options
+from ..utils import get_data_folder
 
-__all__ = ["ImportModelOperator"]
+__all__ = ["FindModelsOperator", "ImportModelOperator"]
+
+# Written to the data folder, so it is only rebuilt for the models that changed
+_CATALOGUE_NAME = "model_catalogue.json"
 
 
 @final
@@ -56,3 +63,37 @@ class ImportModelOperator(Operator):
             for object in objects:
                 model_collection.objects.link(object)
         return {"FINISHED"}
+
+
+@final
+class FindModelsOperator(Operator):
+    bl_idname = "ekur.findmodels"
+    bl_label = "Find Models"
+    bl_description = "Find the models of the data folder that use the material or have the permutation, and set the model path to the first one. The data folder is catalogued on first use"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context: Context | None) -> set[str]:  # ty:ignore[invalid-method-override]
+        options = get_model_options()
+        data_folder = Path(get_data_folder())
+        if not data_folder.is_dir():
+            self.report({"ERROR"}, f"Data folder does not exist: {data_folder}")
+            return {"CANCELLED"}
+        try:
+            catalogue = build_catalogue(data_folder, data_folder / _CATALOGUE_NAME)
+        except OSError as e:
+            self.report({"ERROR"}, f"Failed to catalogue the data folder: {e}")
+            return {"CANCELLED"}
+
+        if options.search_type == "MATERIAL":
+            models = find_models_with_material(catalogue, options.search_id)
+        else:
+            models = find_models_with_permutation(catalogue, options.search_id)
+        kind = options.search_type.lower()
+        if not models:
+            self.report({"WARNING"}, f"No models found with {kind} {options.search_id}")
+            return {"CANCELLED"}
+        for model in models:
+            logging.info(f"Model with {kind} {options.search_id}: {model}")
+        options.model_path = str(data_folder / models[0])
+        self.report({"INFO"}, f"Found {len(models)} models with {kind} {options.search_id}")
+        return {"FINISHED"}
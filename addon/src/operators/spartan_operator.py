@@ -121,7 +121,7 @@ class ImportSpartanOperator(Operator):
             for attach in attachments:
                 if attach_name:
                     attach.name = attach_name["name"]
-                markers = [marker for marker in importer.markers if alt_name in marker.name]
+                markers = importer.find_markers("", alt_name)
                 import_attachments("", alt_name, markers[-1], attach, rig)
                 if attach.name not in attachment_collection.objects:
                     attachment_collection.objects.link(attach)
@@ -182,11 +182,7 @@ class ImportSpartanOperator(Operator):
                             attachment.name = f"{region['name']}_{attach_name['name']}"
                         name = f"{perm_region['attachment']['marker_name']}_{perm}_{perm_region['name']}"
                         alt_name = f"{perm_region['attachment']['marker_name']}_{perm}"
-                        markers = [
-                            marker
-                            for marker in importer.markers
-                            if marker.name == name or alt_name in marker.name
-                        ]
+                        markers = importer.find_markers(name, alt_name)
                         import_attachments(name, alt_name, markers[-1], attachment, rig)
                         if attachment.name not in region_collection.objects:
                             region_collection.objects.link(attachment)
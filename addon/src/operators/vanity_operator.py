@@ -20,6 +20,7 @@ from ..json_definitions import (
     CylixVanityResponse,
     RegionData,
 )
+from ..model.importer.markers import MarkerPoint
 from ..model.importer.model_importer import ModelImporter
 from ..ui.material_options import get_material_options
 from ..ui.model_options import get_model_options
@@ -51,7 +52,7 @@ def import_custom_rig() -> Object | None:
 def import_attachments(
     name: str,
     alt_name: str,
-    marker: Object,
+    marker: Object | MarkerPoint,
     attachment: Object,
     rig: Object | None,
 ) -> None:
@@ -309,11 +310,7 @@ class ImportVanityOperator(Operator):
                     attachments = ModelImporter().start_import(model_path, False)
                     alt_name = f"{attachment[0]['marker_name']}"
                     for attach in attachments:
-                        markers = [
-                            marker
-                            for marker in importer.markers
-                            if marker.name == name or alt_name in marker.name
-                        ]
+                        markers = importer.find_markers(name, alt_name)
                         if len(markers) > 0:
                             import_attachments("", alt_name, markers[-1], attach, importer.rig)
                             if attach.name not in col.objects:
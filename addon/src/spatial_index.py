@@ -0,0 +1,185 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2026 The Halo Archive
+import numpy as np
+import numpy.typing as npt
+
+__all__ = ["SpatialGrid", "frustum_planes"]
+
+_EPSILON = 1e-6
+
+
+def frustum_planes(corners: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    """
+    Gets the planes enclosing a frustum.
+
+    Args:
+    - corners: The (8, 3) corners of the frustum, the 4 near corners followed by the 4 far
+      corners in the same order around the frustum.
+
+    Returns:
+    - The (6, 4) planes as (normal, distance), with the normals pointing into the frustum.
+    """
+    points = np.asarray(corners, dtype=np.float64).reshape(8, 3)
+    near, far = points[:4], points[4:]
+    triangles = [(near[0], near[1], near[2]), (far[0], far[1], far[2])]
+    for i in range(4):
+        triangles.append((near[i], near[(i + 1) % 4], far[i]))
+    centroid = points.mean(axis=0)
+
+    planes = np.empty((6, 4), dtype=np.float64)
+    for i, (a, b, c) in enumerate(triangles):
+        normal = np.cross(b - a, c - a)
+        normal /= max(float(np.linalg.norm(normal)), _EPSILON)
+        distance = -float(normal @ a)
+        if normal @ centroid + distance < 0:
+            normal, distance = -normal, -distance
+        planes[i, :3] = normal
+        planes[i, 3] = distance
+    return planes
+
+
+class SpatialGrid:
+    """
+    Uniform grid over a set of axis aligned bounding boxes. Boxes are bucketed by the cell their
+    center falls in, boxes larger than a cell are kept aside and always tested.
+    """
+
+    def __init__(
+        self,
+        bounds_min: npt.ArrayLike,
+        bounds_max: npt.ArrayLike,
+        cell_size: float | None = None,
+    ) -> None:
+        """
+        Builds the grid.
+
+        Args:
+        - bounds_min: The (n, 3) minimum corners of the boxes.
+        - bounds_max: The (n, 3) maximum corners of the boxes.
+        - cell_size: Optional size of a cell. By default it is picked so a cell holds a few boxes
+          and fits most of them.
+        """
+        self.bounds_min: npt.NDArray[np.float64] = np.asarray(bounds_min, dtype=np.float64).reshape(
+            -1, 3
+        )
+        self.bounds_max: npt.NDArray[np.float64] = np.asarray(bounds_max, dtype=np.float64).reshape(
+            -1, 3
+        )
+        count = len(self.bounds_min)
+        extents = (self.bounds_max - self.bounds_min).max(axis=1) if count else np.zeros(0)
+        self.origin: npt.NDArray[np.float64] = self.bounds_min.min(axis=0) if count else np.zeros(3)
+        if cell_size is None:
+            span = (
+                np.maximum(self.bounds_max.max(axis=0) - self.origin, 1.0) if count else np.ones(3)
+            )
+            cell_size = max(
+                float(np.cbrt(np.prod(span) / max(count, 1))) * 2.0,
+                float(np.median(extents)) if count else 0.0,
+                _EPSILON,
+            )
+        self.cell_size: float = cell_size
+
+        large = extents > cell_size
+        self._large: npt.NDArray[np.int64] = np.flatnonzero(large)
+        small = np.flatnonzero(~large)
+        centers = (self.bounds_min[small] + self.bounds_max[small]) * 0.5
+        cells = np.floor((centers - self.origin) / cell_size).astype(np.int64)
+        self._dims: npt.NDArray[np.int64] = (
+            cells.max(axis=0) + 1 if len(cells) else np.ones(3, dtype=np.int64)
+        )
+        keys = self._cell_keys(cells)
+        order = np.argsort(keys, kind="stable")
+        self._order: npt.NDArray[np.int64] = small[order]
+        self._keys, self._starts = np.unique(keys[order], return_index=True)
+        self._ends: npt.NDArray[np.int64] = np.append(self._starts[1:], len(order))
+
+    def __len__(self) -> int:
+        return len(self.bounds_min)
+
+    def _cell_keys(self, cells: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        return (cells[:, 0] * self._dims[1] + cells[:, 1]) * self._dims[2] + cells[:, 2]
+
+    def _candidates(
+        self, query_min: npt.NDArray[np.float64], query_max: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.int64]:
+        # Boxes in the buckets are at most one cell wide, so their centers lie within half a cell
+        # of any box they overlap
+        half = self.cell_size * 0.5
+        first = np.floor((query_min - half - self.origin) / self.cell_size).astype(np.int64)
+        last = np.floor((query_max + half - self.origin) / self.cell_size).astype(np.int64)
+        first = np.maximum(first, 0)
+        last = np.minimum(last, self._dims - 1)
+        if np.any(last < first):
+            return self._large
+        if np.prod(last - first + 1) > len(self._keys):
+            return np.concatenate((self._order, self._large))
+
+        cells = np.stack(
+            np.meshgrid(*(np.arange(a, b + 1) for a, b in zip(first, last)), indexing="ij"),
+            axis=-1,
+        ).reshape(-1, 3)
+        keys = self._cell_keys(cells)
+        found = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        found = found[self._keys[found] == keys]
+        ranges = [self._order[self._starts[i] : self._ends[i]] for i in found]
+        return np.concatenate([*ranges, self._large])
+
+    def query_box(self, box_min: npt.ArrayLike, box_max: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """
+        Finds the boxes overlapping an axis aligned box.
+
+        Args:
+        - box_min: The minimum corner of the box.
+        - box_max: The maximum corner of the box.
+
+        Returns:
+        - The sorted indices of the overlapping boxes.
+        """
+        query_min = np.minimum(box_min, box_max).astype(np.float64)
+        query_max = np.maximum(box_min, box_max).astype(np.float64)
+        candidates = self._candidates(query_min, query_max)
+        inside = np.all(
+            (self.bounds_min[candidates] <= query_max) & (self.bounds_max[candidates] >= query_min),
+            axis=1,
+        )
+        return np.sort(candidates[inside])
+
+    def query_sphere(self, center: npt.ArrayLike, radius: float) -> npt.NDArray[np.int64]:
+        """
+        Finds the boxes overlapping a sphere.
+
+        Args:
+        - center: The center of the sphere.
+        - radius: The radius of the sphere.
+
+        Returns:
+        - The sorted indices of the overlapping boxes.
+        """
+        center_array = np.asarray(center, dtype=np.float64).reshape(3)
+        candidates = self._candidates(center_array - radius, center_array + radius)
+        closest = np.clip(center_array, self.bounds_min[candidates], self.bounds_max[candidates])
+        distances = np.sum((closest - center_array) ** 2, axis=1)
+        return np.sort(candidates[distances <= radius * radius])
+
+    def query_frustum(self, corners: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """
+        Finds the boxes overlapping a frustum. Boxes near the edges of the frustum may be reported
+        even if they are just outside of it.
+
+        Args:
+        - corners: The (8, 3) corners of the frustum, see `frustum_planes`.
+
+        Returns:
+        - The sorted indices of the overlapping boxes.
+        """
+        points = np.asarray(corners, dtype=np.float64).reshape(8, 3)
+        candidates = self._candidates(points.min(axis=0), points.max(axis=0))
+        planes = frustum_planes(points)
+        bounds_min = self.bounds_min[candidates]
+        bounds_max = self.bounds_max[candidates]
+        inside = np.ones(len(candidates), dtype=bool)
+        for plane in planes:
+            # The corner furthest along the normal is the last one to leave the plane
+            corner = np.where(plane[:3] >= 0, bounds_max, bounds_min)
+            inside &= corner @ plane[:3] + plane[3] >= 0
+        return np.sort(candidates[inside])
@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2026 The Halo Archive
+import numpy as np
+import numpy.typing as npt
+
+__all__ = ["compose_matrices", "orthonormal_frames", "rotations_to_quaternions"]
+
+_EPSILON = 1e-6
+
+
+def _normalize(vectors: npt.NDArray[np.float64]) -> tuple[npt.NDArray[np.float64], npt.NDArray]:
+    lengths = np.linalg.norm(vectors, axis=-1)
+    valid = np.isfinite(lengths) & (lengths > _EPSILON)
+    safe = np.where(valid, lengths, 1.0)
+    return vectors / safe[:, None], valid
+
+
+def orthonormal_frames(
+    forward: npt.ArrayLike, up: npt.ArrayLike
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.bool_]]:
+    """
+    Builds the rotation matrices of instances from their forward and up vectors. The up vector is
+    made orthogonal to the forward vector, and the left vector is derived from both, so every
+    valid frame is a proper rotation.
+
+    Args:
+    - forward: The (n, 3) forward vectors.
+    - up: The (n, 3) up vectors.
+
+    Returns:
+    - The (n, 3, 3) rotation matrices, with the forward, left and up vectors as columns.
+    - A (n,) mask of the frames that are valid. Frames with a zero length, non finite or parallel
+      forward and up vector are invalid and their rotation is the identity.
+    """
+    forward_array = np.asarray(forward, dtype=np.float64).reshape(-1, 3)
+    up_array = np.asarray(up, dtype=np.float64).reshape(-1, 3)
+    f, forward_valid = _normalize(forward_array)
+    projected = up_array - np.einsum("ij,ij->i", up_array, f)[:, None] * f
+    u, up_valid = _normalize(projected)
+    left = np.cross(u, f)
+    rotations = np.stack((f, left, u), axis=-1)
+
+    valid = forward_valid & up_valid
+    rotations[~valid] = np.eye(3)
+    return rotations, valid
+
+
+def compose_matrices(
+    positions: npt.ArrayLike,
+    rotations: npt.NDArray[np.float64],
+    scales: npt.ArrayLike,
+    offsets: npt.ArrayLike | None = None,
+) -> npt.NDArray[np.float64]:
+    """
+    Composes the world matrices of instances, the batched equivalent of `Matrix.LocRotScale`.
+
+    Args:
+    - positions: The (n, 3) positions.
+    - rotations: The (n, 3, 3) rotation matrices.
+    - scales: The (n, 3) scales.
+    - offsets: Optional (n, 3) local offsets, such as the origin of an RTGO piece. They are scaled
+      and rotated with the instance before being added to its position.
+
+    Returns:
+    - The (n, 4, 4) world matrices.
+    """
+    count = len(rotations)
+    position_array = np.asarray(positions, dtype=np.float64).reshape(count, 3)
+    scale_array = np.asarray(scales, dtype=np.float64).reshape(count, 3)
+    matrices = np.zeros((count, 4, 4), dtype=np.float64)
+    matrices[:, :3, :3] = rotations * scale_array[:, None, :]
+    matrices[:, :3, 3] = position_array
+    if offsets is not None:
+        offset_array = np.asarray(offsets, dtype=np.float64).reshape(count, 3)
+        matrices[:, :3, 3] += np.einsum("nij,nj->ni", rotations, offset_array * scale_array)
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def rotations_to_quaternions(rotations: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """
+    Converts rotation matrices to quaternions.
+
+    Args:
+    - rotations: The (n, 3, 3) rotation matrices.
+
+    Returns:
+    - The (n, 4) quaternions in wxyz order, with a non negative w.
+    """
+    m = np.asarray(rotations, dtype=np.float64).reshape(-1, 3, 3)
+    m00, m01, m02 = m[:, 0, 0], m[:, 0, 1], m[:, 0, 2]
+    m10, m11, m12 = m[:, 1, 0], m[:, 1, 1], m[:, 1, 2]
+    m20, m21, m22 = m[:, 2, 0], m[:, 2, 1], m[:, 2, 2]
+
+    # Every row holds 4 * q * q[k] for the quaternion component k with the largest magnitude, pick
+    # that one for numerical stability
+    candidates = np.stack(
+        (
+            np.stack((1.0 + m00 + m11 + m22, m21 - m12, m02 - m20, m10 - m01), axis=-1),
+            np.stack((m21 - m12, 1.0 + m00 - m11 - m22, m01 + m10, m02 + m20), axis=-1),
+            np.stack((m02 - m20, m01 + m10, 1.0 - m00 + m11 - m22, m12 + m21), axis=-1),
+            np.stack((m10 - m01, m02 + m20, m12 + m21, 1.0 - m00 - m11 + m22), axis=-1),
+        ),
+        axis=1,
+    )
+    diagonal = np.stack((m00 + m11 + m22, m00, m11, m22), axis=-1)
+    best = np.argmax(diagonal, axis=-1)
+    quaternions = candidates[np.arange(len(m)), best]
+    quaternions /= np.linalg.norm(quaternions, axis=-1, keepdims=True)
+    quaternions[quaternions[:, 0] < 0] *= -1.0
+    return quaternions
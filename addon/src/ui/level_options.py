@@ -3,7 +3,13 @@
 from typing import cast
 
 import bpy
-from bpy.props import StringProperty
+from bpy.props import (
+    BoolProperty,
+    EnumProperty,
+    FloatProperty,
+    FloatVectorProperty,
+    StringProperty,
+)
 from bpy.types import PropertyGroup, UILayout
 
 
@@ -11,13 +17,42 @@ class LevelOptions(PropertyGroup):
     level_path: StringProperty(
         default="",
         name="Level Path",
-        description="Path to .json level file to import.",
+        description="Path to .json or binary .eklv level file to import.",
         subtype="FILE_PATH",
     )
+    use_instancing: BoolProperty(
+        name="Use Instancing",
+        description="Place each geometry on the points of a single object with a geometry nodes instancer instead of creating an object per instance.",
+        default=False,
+    )
+    spatial_filter: EnumProperty(
+        name="Area",
+        description="Part of the level to import.",
+        items=[
+            ("NONE", "Whole Level", "Import every instance of the level"),
+            ("BOX", "Box", "Import the instances overlapping a box"),
+            ("CURSOR", "Around 3D Cursor", "Import the instances within a radius of the 3D cursor"),
+            ("CAMERA", "Camera View", "Import the instances in view of the active camera"),
+        ],
+        default="NONE",
+    )
+    box_min: FloatVectorProperty(name="Box Min", subtype="XYZ", size=3, default=(0.0, 0.0, 0.0))
+    box_max: FloatVectorProperty(name="Box Max", subtype="XYZ", size=3, default=(0.0, 0.0, 0.0))
+    radius: FloatProperty(
+        name="Radius",
+        description="Radius around the 3D cursor to import instances in.",
+        default=100.0,
+        min=0.0,
+    )
 
 
 class LevelOptionsType:
     level_path: str = ""
+    use_instancing: bool = False
+    spatial_filter: str = "NONE"
+    box_min: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    box_max: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    radius: float = 100.0
 
 
 def get_level_options() -> LevelOptionsType:
@@ -35,4 +70,13 @@ def draw_level_options(layout: UILayout, props: LevelOptionsType) -> None:
     if level_body:
         level_opts = level_body.box()
         level_opts.prop(props, "level_path")
+        level_opts.prop(props, "use_instancing")
+        level_opts.prop(props, "spatial_filter")
+        if props.spatial_filter == "BOX":
+            level_opts.prop(props, "box_min")
+            level_opts.prop(props, "box_max")
+        elif props.spatial_filter == "CURSOR":
+            level_opts.prop(props, "radius")
         _ = level_body.operator("ekur.importlevel")
+        _ = level_body.operator("ekur.realizelevelinstances")
+        _ = level_body.operator("ekur.convertlevel")
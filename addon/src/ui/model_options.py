@@ -3,7 +3,7 @@
 from typing import cast
 
 import bpy
-from bpy.props import BoolProperty, FloatProperty, StringProperty
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty, StringProperty
 from bpy.types import PropertyGroup, UILayout
 
 
@@ -24,6 +24,11 @@ class ModelOptions(PropertyGroup):
         description="Whether to import markers as empties for model.",
         default=True,
     )
+    compact_markers: BoolProperty(
+        name="Compact Markers",
+        description="Import markers as the vertices of a single mesh instead of one empty per marker.",
+        default=False,
+    )
     import_bones: BoolProperty(
         name="Import Bones", description="Import armatures and weight data for model.", default=True
     )
@@ -37,11 +42,21 @@ class ModelOptions(PropertyGroup):
         description="Whether to import vertex color as a mesh attribute for models that support it.",
         default=False,
     )
+    import_shape_keys: BoolProperty(
+        name="Import Shape Keys",
+        description="Whether to import blendshapes as shape keys for models that support it.",
+        default=True,
+    )
     remove_unused_groups: BoolProperty(
         name="Remove Unused Groups",
         description="Whether to remove weight groups that don't have any values attached",
         default=False,
     )
+    strict_validation: BoolProperty(
+        name="Strict Validation",
+        description="Always validate imported meshes with Blender. Triangles that reference missing vertices or are degenerate are dropped either way.",
+        default=False,
+    )
     scale_factor: FloatProperty(
         name="Scale Factor",
         description="Factor to scale the mesh up by from its in-game size.",
@@ -52,18 +67,37 @@ class ModelOptions(PropertyGroup):
         description="Factor to scale up bones by.",
         default=0.03,
     )
+    search_type: EnumProperty(
+        name="Search By",
+        description="What to look for in the models of the data folder.",
+        items=[
+            ("MATERIAL", "Material", "Find the models that use a material"),
+            ("PERMUTATION", "Permutation", "Find the models that have a permutation"),
+        ],
+        default="MATERIAL",
+    )
+    search_id: IntProperty(
+        name="Search Id",
+        description="Id of the material or permutation name to find the models of.",
+        default=0,
+    )
 
 
 class ModelOptionsType:
     model_path: str = ""
     import_materials: bool = True
     import_markers: bool = True
+    compact_markers: bool = False
     import_bones: bool = True
     import_collections: bool = True
     import_vertex_color: bool = False
+    import_shape_keys: bool = True
     remove_unused_groups: bool = False
+    strict_validation: bool = False
     scale_factor: float = 1.0
     bone_size: float = 0.03
+    search_type: str = "MATERIAL"
+    search_id: int = 0
 
 
 def get_model_options() -> ModelOptionsType:
@@ -82,11 +116,18 @@ def draw_model_options(layout: UILayout, props: ModelOptionsType) -> None:
         model_opts = model_body.box()
         model_opts.prop(props, "model_path")
         model_opts.prop(props, "import_markers")
+        model_opts.prop(props, "compact_markers")
         model_opts.prop(props, "import_bones")
         model_opts.prop(props, "import_materials")
         model_opts.prop(props, "import_collections")
         model_opts.prop(props, "import_vertex_color")
+        model_opts.prop(props, "import_shape_keys")
         model_opts.prop(props, "remove_unused_groups")
+        model_opts.prop(props, "strict_validation")
         model_opts.prop(props, "scale_factor")
         model_opts.prop(props, "bone_size")
         _ = model_body.operator("ekur.importmodel")
+        search_opts = model_body.box()
+        search_opts.prop(props, "search_type")
+        search_opts.prop(props, "search_id")
+        _ = search_opts.operator("ekur.findmodels")
@@ -38,6 +38,7 @@ __all__ = [
     "create_link",
     "assign_value",
     "get_data_folder",
+    "get_model_cache_folder",
     "is_debug",
     "get_addon_preferences",
     "AddonPreferencesType",
@@ -161,6 +162,8 @@ class AddonPreferencesType:
     dump_textures: bool = True
     is_campaign: bool = False
     debug: bool = False
+    use_model_cache: bool = True
+    model_cache_size: int = 2048
 
 
 def is_debug() -> bool:
@@ -181,6 +184,15 @@ def get_data_folder() -> str:
     return get_addon_preferences().data_folder
 
 
+def get_model_cache_folder() -> str:
+    """Get the folder decoded models are cached in.
+
+    Returns:
+        The model cache folder path.
+    """
+    return bpy.utils.extension_path_user(get_package_name(), path="model_cache", create=True)
+
+
 def get_package_name() -> str:
     if __package__ is None:
         return ""